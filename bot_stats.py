@@ -0,0 +1,128 @@
+"""
+Потокобезопасная статистика Instagram бота
+Атомарные снимки + поток событий для подписчиков (Telegram контроллер)
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from bot_logging import get_logger
+
+
+logger = get_logger('stats')
+
+
+# Подписчик получает событие: {'seq', 'name', 'delta', 'value', 'at', 'snapshot'}
+StatsListener = Callable[[Dict], None]
+
+
+class BotStats:
+    """Статистика сессии: монотонные счетчики и текущие значения под одной блокировкой"""
+
+    # Счетчики только растут (increment)
+    COUNTERS = ('followed_today', 'unfollowed_today', 'followed_back_today')
+
+    # Текущие значения (set)
+    GAUGES = ('start_followers', 'current_followers')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {name: 0 for name in self.COUNTERS + self.GAUGES}
+        self._seq = 0
+        self._listeners: List[StatsListener] = []
+
+    def subscribe(self, listener: StatsListener):
+        """
+        Подписаться на события изменения статистики
+
+        Args:
+            listener: Вызывается в потоке, который изменил статистику
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: StatsListener):
+        """Отписаться от событий"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def increment(self, name: str, delta: int = 1):
+        """
+        Увеличить счетчик
+
+        Args:
+            name: Имя счетчика из COUNTERS
+            delta: Прирост (только положительный)
+        """
+        if name not in self.COUNTERS:
+            raise KeyError(f"Unknown counter: {name}")
+        if delta < 0:
+            raise ValueError(f"Counter {name} can only increase")
+
+        with self._lock:
+            self._values[name] += delta
+            event = self._make_event(name, delta)
+            listeners = list(self._listeners)
+
+        self._publish(event, listeners)
+
+    def set(self, name: str, value: int):
+        """
+        Установить текущее значение
+
+        Args:
+            name: Имя из GAUGES
+            value: Новое значение
+        """
+        if name not in self.GAUGES:
+            raise KeyError(f"Unknown gauge: {name}")
+
+        with self._lock:
+            delta = value - self._values[name]
+            self._values[name] = value
+            event = self._make_event(name, delta)
+            listeners = list(self._listeners)
+
+        self._publish(event, listeners)
+
+    def snapshot(self) -> Dict:
+        """
+        Атомарный снимок статистики (без сетевых запросов)
+
+        Returns:
+            Копия всех значений + followers_gained
+        """
+        with self._lock:
+            return self._snapshot_locked()
+
+    def __getitem__(self, name: str) -> int:
+        """Чтение одного значения: stats['followed_today']"""
+        return self.snapshot()[name]
+
+    def _snapshot_locked(self) -> Dict:
+        """Снимок (вызывать под self._lock)"""
+        data = dict(self._values)
+        data['followers_gained'] = data['current_followers'] - data['start_followers']
+        return data
+
+    def _make_event(self, name: str, delta: int) -> Dict:
+        """Сформировать событие (вызывать под self._lock)"""
+        self._seq += 1
+        return {
+            'seq': self._seq,
+            'name': name,
+            'delta': delta,
+            'value': self._values[name],
+            'at': datetime.now().isoformat(),
+            'snapshot': self._snapshot_locked(),
+        }
+
+    def _publish(self, event: Dict, listeners: List[StatsListener]):
+        """Разослать событие вне блокировки - подписчик не должен ломать воркер"""
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"⚠️ Stats listener error: {e}")
@@ -0,0 +1,153 @@
+"""
+Аналитика взаимных подписок по источникам аудитории
+История подписок загружается в колонки (array), отчет считается за один проход
+"""
+
+import json
+import math
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+from relationship_archive import RelationshipArchive
+
+
+# Источник для записей, сделанных до появления поля 'source'
+UNKNOWN_SOURCE = 'unknown'
+
+WEEK = 7 * 24 * 60 * 60
+
+
+@dataclass
+class FollowColumns:
+    """История подписок в колоночном виде"""
+    sources: List[str]        # Словарь источников (индекс -> имя)
+    source_idx: array         # 'I': индекс источника
+    followed_at: array        # 'd': unix time подписки
+    followed_back_at: array   # 'd': unix time взаимной подписки (NaN - нет)
+
+
+def _timestamp(value) -> float:
+    """ISO-строка -> unix time (NaN если пусто)"""
+    if not value:
+        return math.nan
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_columns(records: Iterable[Tuple[str, Dict]]) -> FollowColumns:
+    """
+    Разложить записи followed_users по колонкам
+
+    Args:
+        records: Пары (user_id, запись) из followed_users
+
+    Returns:
+        FollowColumns
+    """
+    sources: List[str] = []
+    codes: Dict[str, int] = {}
+    columns = FollowColumns(sources, array('I'), array('d'), array('d'))
+
+    for _, data in records:
+        source = data.get('source') or UNKNOWN_SOURCE
+        code = codes.get(source)
+        if code is None:
+            code = codes[source] = len(sources)
+            sources.append(source)
+
+        columns.source_idx.append(code)
+        columns.followed_at.append(_timestamp(data.get('followed_at')))
+        columns.followed_back_at.append(_timestamp(data.get('followed_back_at')))
+
+    return columns
+
+
+def load_columns_from_file(path: str = 'followed_users.json',
+                           archive: RelationshipArchive = None) -> FollowColumns:
+    """Загрузить колонки из followed_users.json и холодного архива"""
+    try:
+        with open(path, 'r') as f:
+            followed_users = json.load(f)
+    except FileNotFoundError:
+        followed_users = {}
+
+    archive = archive or RelationshipArchive()
+    return load_columns(chain(followed_users.items(), archive.scan()))
+
+
+def _week_start(ts: float) -> float:
+    """Начало недели (понедельник 00:00 UTC) для unix time"""
+    # 1970-01-01 - четверг, сдвигаем на 3 дня, чтобы недели начинались с понедельника
+    shift = 3 * 24 * 60 * 60
+    return ts - (ts + shift) % WEEK
+
+
+def follow_back_report(columns: FollowColumns) -> List[Dict]:
+    """
+    Процент и время взаимной подписки по источникам и неделям (один проход по колонкам)
+
+    Returns:
+        Строки {'source', 'week', 'follows', 'followed_back', 'rate', 'avg_hours'},
+        отсортированные по неделе и источнику
+    """
+    # (источник, неделя) -> [подписок, взаимных, сумма секунд до взаимной]
+    groups: Dict[Tuple[int, float], List[float]] = {}
+
+    for code, followed, back in zip(columns.source_idx, columns.followed_at, columns.followed_back_at):
+        if math.isnan(followed):
+            continue
+
+        key = (code, _week_start(followed))
+        acc = groups.get(key)
+        if acc is None:
+            acc = groups[key] = [0, 0, 0.0]
+
+        acc[0] += 1
+        if not math.isnan(back):
+            acc[1] += 1
+            acc[2] += max(0.0, back - followed)
+
+    rows = []
+    for (code, week), (follows, followed_back, seconds) in groups.items():
+        rows.append({
+            'source': columns.sources[code],
+            'week': (datetime(1970, 1, 1) + timedelta(seconds=week)).date().isoformat(),
+            'follows': follows,
+            'followed_back': followed_back,
+            'rate': followed_back / follows,
+            'avg_hours': (seconds / followed_back / 3600) if followed_back else None,
+        })
+
+    rows.sort(key=lambda r: (r['week'], r['source']))
+    return rows
+
+
+def totals_by_source(rows: List[Dict]) -> List[Dict]:
+    """
+    Свернуть недельный отчет в итоги по источникам
+
+    Returns:
+        Строки {'source', 'follows', 'followed_back', 'rate', 'avg_hours'} по убыванию rate
+    """
+    totals: Dict[str, List[float]] = {}
+    for row in rows:
+        acc = totals.setdefault(row['source'], [0, 0, 0.0])
+        acc[0] += row['follows']
+        acc[1] += row['followed_back']
+        if row['avg_hours'] is not None:
+            acc[2] += row['avg_hours'] * row['followed_back']
+
+    result = [
+        {
+            'source': source,
+            'follows': follows,
+            'followed_back': followed_back,
+            'rate': followed_back / follows if follows else 0.0,
+            'avg_hours': (hours / followed_back) if followed_back else None,
+        }
+        for source, (follows, followed_back, hours) in totals.items()
+    ]
+    result.sort(key=lambda r: r['rate'], reverse=True)
+    return result
@@ -0,0 +1,162 @@
+"""
+Дельты подписчиков между снимками
+Снимки хранятся как отсортированные массивы int64, разница считается линейным слиянием
+"""
+
+import os
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+
+def to_sorted_array(user_ids: Iterable) -> array:
+    """
+    Превратить набор user_id в компактный отсортированный массив
+
+    Args:
+        user_ids: ID пользователей (int или str)
+
+    Returns:
+        array('q') без дубликатов, по возрастанию
+    """
+    return array('q', sorted({int(uid) for uid in user_ids}))
+
+
+def contains(ids: array, user_id: int) -> bool:
+    """Есть ли user_id в отсортированном массиве (бинарный поиск)"""
+    pos = bisect_left(ids, user_id)
+    return pos < len(ids) and ids[pos] == user_id
+
+
+def diff_sorted(old: array, new: array) -> Tuple[array, array]:
+    """
+    Линейное слияние двух отсортированных массивов
+
+    Args:
+        old: Предыдущий снимок
+        new: Текущий снимок
+
+    Returns:
+        (added, removed) - кто появился и кто пропал
+    """
+    added = array('q')
+    removed = array('q')
+    i, j = 0, 0
+    len_old, len_new = len(old), len(new)
+
+    while i < len_old and j < len_new:
+        a, b = old[i], new[j]
+        if a == b:
+            i += 1
+            j += 1
+        elif a < b:
+            removed.append(a)
+            i += 1
+        else:
+            added.append(b)
+            j += 1
+
+    removed.extend(old[i:])
+    added.extend(new[j:])
+    return added, removed
+
+
+@dataclass
+class FollowerDelta:
+    """Изменения подписчиков между двумя снимками"""
+    added: array
+    removed: array
+    total: int
+    previous_total: int
+
+
+class FollowerDeltaEngine:
+    """Хранилище снимков подписчиков и расчет дельт"""
+
+    def __init__(self, directory: str = 'follower_snapshots', keep: int = 5):
+        """
+        Args:
+            directory: Папка для снимков (<unix_time>.bin)
+            keep: Сколько последних снимков хранить
+        """
+        self.directory = directory
+        self.keep = keep
+
+    def _snapshot_files(self) -> List[str]:
+        """Файлы снимков от старых к новым"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = [n for n in os.listdir(self.directory) if n.endswith('.bin')]
+        names.sort(key=lambda n: int(n[:-4]))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def latest(self) -> Optional[array]:
+        """Последний сохраненный снимок (или None)"""
+        latest = self.latest_with_time()
+        return latest[1] if latest else None
+
+    def latest_time(self) -> Optional[float]:
+        """Время последнего снимка (unix) по имени файла, без чтения снимка"""
+        files = self._snapshot_files()
+        return self._taken_at(files[-1]) if files else None
+
+    def latest_with_time(self) -> Optional[Tuple[float, array]]:
+        """Последний снимок и время его создания (unix), или None"""
+        files = self._snapshot_files()
+        if not files:
+            return None
+
+        ids = array('q')
+        with open(files[-1], 'rb') as f:
+            ids.frombytes(f.read())
+        return self._taken_at(files[-1]), ids
+
+    @staticmethod
+    def _taken_at(path: str) -> float:
+        """Время снимка (unix) из имени файла <unix_time_ms>.bin"""
+        return int(os.path.basename(path)[:-4]) / 1000
+
+    def save_snapshot(self, ids: array):
+        """
+        Сохранить снимок и удалить лишние старые
+
+        Args:
+            ids: Отсортированный массив (см. to_sorted_array)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{int(time.time() * 1000)}.bin")
+
+        # Пишем во временный файл, чтобы не оставить обрезанный снимок
+        with open(path + '.tmp', 'wb') as f:
+            ids.tofile(f)
+        os.replace(path + '.tmp', path)
+
+        for old in self._snapshot_files()[:-self.keep]:
+            os.remove(old)
+
+    def update(self, user_ids: Iterable) -> Optional[FollowerDelta]:
+        """
+        Сохранить новый снимок и посчитать разницу с предыдущим
+
+        Args:
+            user_ids: Текущие подписчики
+
+        Returns:
+            FollowerDelta или None, если это первый снимок
+        """
+        current = to_sorted_array(user_ids)
+        previous = self.latest()
+        self.save_snapshot(current)
+
+        if previous is None:
+            return None
+
+        added, removed = diff_sorted(previous, current)
+        return FollowerDelta(
+            added=added,
+            removed=removed,
+            total=len(current),
+            previous_total=len(previous)
+        )
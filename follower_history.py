@@ -0,0 +1,199 @@
+"""
+Временной ряд подписчиков (round-robin архив фиксированного размера)
+Хранит количество подписчиков, подписки и отписки по интервалам между сессиями
+"""
+
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Заголовок файла: magic, версия, количество архивов
+HEADER = struct.Struct('<4sHH')
+# Описание архива: шаг (сек), количество слотов
+ARCHIVE_HEADER = struct.Struct('<II')
+# Запись: начало интервала (unix time), подписчики (-1 = нет замера), подписки, отписки
+RECORD = struct.Struct('<qiii')
+
+MAGIC = b'IGTS'
+VERSION = 1
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Архивы: (шаг, слотов). Каждое обновление пишется во все архивы сразу,
+# поэтому даунсемплинг происходит автоматически, а размер файла не растет
+ARCHIVES = (
+    (HOUR, 7 * 24),   # Почасово за 7 дней
+    (DAY, 400),       # По дням за ~13 месяцев
+)
+
+# Точка ряда: (начало интервала, подписчики, подписки, отписки)
+Point = Tuple[int, int, int, int]
+
+
+class FollowerTimeSeries:
+    """Round-robin архив: фиксированные записи, ограниченный срок хранения"""
+
+    def __init__(self, path: str = 'follower_history.rrd'):
+        """
+        Args:
+            path: Файл архива (создается при первой записи)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Смещение первой записи каждого архива в файле
+        self._offsets = []
+        offset = HEADER.size + ARCHIVE_HEADER.size * len(ARCHIVES)
+        for step, slots in ARCHIVES:
+            self._offsets.append(offset)
+            offset += RECORD.size * slots
+        self._file_size = offset
+
+    def record(self, followers: Optional[int] = None, follows: int = 0,
+               unfollows: int = 0, at: Optional[float] = None):
+        """
+        Добавить замер/события в текущий интервал всех архивов
+
+        Args:
+            followers: Текущее количество подписчиков (None - без замера)
+            follows: Сколько подписок сделано
+            unfollows: Сколько отписок сделано
+            at: Время (unix), по умолчанию сейчас
+        """
+        now = int(at if at is not None else time.time())
+        value = followers if followers is not None else -1
+
+        with self._lock:
+            self._ensure_file()
+            with open(self.path, 'r+b') as f:
+                for index, (step, slots) in enumerate(ARCHIVES):
+                    bucket = now - now % step
+                    pos = self._offsets[index] + RECORD.size * ((bucket // step) % slots)
+
+                    f.seek(pos)
+                    ts, old_followers, old_follows, old_unfollows = RECORD.unpack(f.read(RECORD.size))
+
+                    # Слот занят старым интервалом - перезаписываем (round-robin)
+                    if ts != bucket:
+                        old_followers, old_follows, old_unfollows = -1, 0, 0
+
+                    f.seek(pos)
+                    f.write(RECORD.pack(
+                        bucket,
+                        value if value >= 0 else old_followers,
+                        old_follows + follows,
+                        old_unfollows + unfollows
+                    ))
+
+    def on_stats_event(self, event: Dict):
+        """Подписчик BotStats: переносит события статистики в архив"""
+        if event['name'] == 'followed_today':
+            self.record(follows=event['delta'])
+        elif event['name'] == 'unfollowed_today':
+            self.record(unfollows=event['delta'])
+        elif event['name'] == 'current_followers':
+            self.record(followers=event['value'])
+
+    def series(self, days: int, now: Optional[float] = None) -> List[Point]:
+        """
+        Точки за последние N дней (читаются только нужные слоты)
+
+        Args:
+            days: Глубина в днях
+            now: Текущее время (unix), по умолчанию сейчас
+
+        Returns:
+            Список точек по возрастанию времени (только заполненные интервалы)
+        """
+        now = int(now if now is not None else time.time())
+        index = self._pick_archive(days)
+        step, slots = ARCHIVES[index]
+
+        last = now - now % step
+        count = min(slots, (days * DAY) // step)
+        first = last - (count - 1) * step
+
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, 'rb') as f:
+                self._check_header(f)
+                raw = self._read_slots(f, index, (first // step) % slots, count)
+
+        points = []
+        for ts, followers, follows, unfollows in RECORD.iter_unpack(raw):
+            # Пустые слоты и устаревшие круги пропускаем
+            if first <= ts <= last:
+                points.append((ts, followers, follows, unfollows))
+        points.sort()
+        return points
+
+    def summary(self, days: int, now: Optional[float] = None) -> Dict:
+        """
+        Сводка за последние N дней
+
+        Returns:
+            start_followers, end_followers, change, follows, unfollows, points
+        """
+        points = self.series(days, now=now)
+        measured = [p[1] for p in points if p[1] >= 0]
+
+        start = measured[0] if measured else None
+        end = measured[-1] if measured else None
+
+        return {
+            'days': days,
+            'start_followers': start,
+            'end_followers': end,
+            'change': (end - start) if measured else 0,
+            'follows': sum(p[2] for p in points),
+            'unfollows': sum(p[3] for p in points),
+            'points': len(points),
+        }
+
+    def _pick_archive(self, days: int) -> int:
+        """Самый детальный архив, покрывающий нужный период"""
+        for index, (step, slots) in enumerate(ARCHIVES):
+            if step * slots >= days * DAY:
+                return index
+        return len(ARCHIVES) - 1
+
+    def _read_slots(self, f, index: int, start_slot: int, count: int) -> bytes:
+        """Прочитать count слотов подряд начиная с start_slot (с переходом через конец)"""
+        slots = ARCHIVES[index][1]
+        first_part = min(count, slots - start_slot)
+
+        f.seek(self._offsets[index] + RECORD.size * start_slot)
+        raw = f.read(RECORD.size * first_part)
+
+        if count > first_part:
+            f.seek(self._offsets[index])
+            raw += f.read(RECORD.size * (count - first_part))
+        return raw
+
+    def _ensure_file(self):
+        """Создать файл архива фиксированного размера (вызывать под self._lock)"""
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                self._check_header(f)
+            return
+
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(ARCHIVES)))
+            for step, slots in ARCHIVES:
+                f.write(ARCHIVE_HEADER.pack(step, slots))
+            f.write(b'\0' * (self._file_size - f.tell()))
+
+    def _check_header(self, f):
+        """Проверить, что файл создан с той же схемой архивов"""
+        f.seek(0)
+        magic, version, count = HEADER.unpack(f.read(HEADER.size))
+        layout = tuple(
+            ARCHIVE_HEADER.unpack(f.read(ARCHIVE_HEADER.size)) for _ in range(count)
+        )
+        if magic != MAGIC or version != VERSION or layout != ARCHIVES:
+            raise ValueError(f"Incompatible history file: {self.path}")
@@ -0,0 +1,70 @@
+"""
+Кэш статуса дружбы (подписан ли пользователь на нас) с TTL
+Позволяет не проверять одних и тех же пользователей при каждом проходе отписок
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class FriendshipCache:
+    """followed_by по user_id с временем проверки; устаревшие записи не отдаются"""
+
+    def __init__(self, path: str = 'friendship_cache.json', ttl: int = 6 * 60 * 60):
+        """
+        Args:
+            path: Файл кэша
+            ttl: Сколько секунд результат проверки считается актуальным
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List] = self._load()
+
+    def _load(self) -> Dict[str, List]:
+        """Загрузить кэш: {user_id: [followed_by, checked_at]}"""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, user_id: int) -> Optional[bool]:
+        """
+        Получить статус из кэша
+
+        Returns:
+            True/False или None, если записи нет или она устарела
+        """
+        with self._lock:
+            entry = self._entries.get(str(user_id))
+        if entry is None or time.time() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def set(self, user_id: int, followed_by: bool):
+        """Запомнить результат проверки"""
+        with self._lock:
+            self._entries[str(user_id)] = [bool(followed_by), time.time()]
+
+    def invalidate(self, user_id: int):
+        """Удалить запись (например, после отписки)"""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def save(self):
+        """Сохранить кэш, выбросив устаревшие записи"""
+        now = time.time()
+        with self._lock:
+            self._entries = {
+                uid: entry for uid, entry in self._entries.items()
+                if now - entry[1] <= self.ttl
+            }
+            data = dict(self._entries)
+
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(self.path + '.tmp', self.path)
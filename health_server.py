@@ -0,0 +1,130 @@
+"""
+Минимальный async HTTP сервер для health/status/metrics
+Работает в том же event loop, что и Telegram Application (без Flask и отдельного потока)
+"""
+
+import asyncio
+import json
+from typing import Callable, Dict, Optional, Union
+
+from bot_logging import get_logger
+
+
+logger = get_logger('http')
+
+
+# Обработчик маршрута: dict -> JSON, str -> text/plain
+RouteHandler = Callable[[], Union[Dict, str]]
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error',
+}
+
+
+class HealthServer:
+    """HTTP сервер на asyncio.start_server для проверок хостинга (Render и т.п.)"""
+
+    # Ограничения на входящий запрос - нам нужны только короткие GET
+    MAX_HEADER_LINES = 100
+    READ_TIMEOUT = 10
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 10000):
+        """
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (на Render берется из переменной PORT)
+        """
+        self.host = host
+        self.port = port
+        self.routes: Dict[str, RouteHandler] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def route(self, path: str, handler: RouteHandler):
+        """
+        Зарегистрировать маршрут
+
+        Args:
+            path: Путь (например '/health')
+            handler: Функция без аргументов, возвращает dict (JSON) или str
+        """
+        self.routes[path] = handler
+
+    async def start(self):
+        """Начать принимать соединения в текущем event loop"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"✅ Web server started on port {self.port}")
+
+    async def stop(self):
+        """Остановить сервер"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обработать одно соединение (один запрос, затем Connection: close)"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), self.READ_TIMEOUT)
+            parts = request_line.decode('latin-1').split()
+
+            # Пустая/мусорная строка запроса - отвечаем сразу, не ждем заголовков
+            if len(parts) < 2:
+                await self._respond(writer, 400, {'error': 'bad request'})
+                return
+
+            # Заголовки нам не нужны, но их надо дочитать
+            for _ in range(self.MAX_HEADER_LINES):
+                line = await asyncio.wait_for(reader.readline(), self.READ_TIMEOUT)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+
+            method = parts[0].upper()
+            path = parts[1].split('?', 1)[0]
+            handler = self.routes.get(path)
+
+            if method not in ('GET', 'HEAD'):
+                status, body = 405, {'error': 'method not allowed'}
+            elif handler is None:
+                status, body = 404, {'error': 'not found'}
+            else:
+                try:
+                    status, body = 200, handler()
+                except Exception as e:
+                    status, body = 500, {'error': str(e)}
+
+            await self._respond(writer, status, body, head_only=(method == 'HEAD'))
+
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int,
+                       body: Union[Dict, str], head_only: bool = False):
+        """Записать HTTP ответ"""
+        if isinstance(body, str):
+            payload = body.encode('utf-8')
+            content_type = 'text/plain; charset=utf-8'
+        else:
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json'
+
+        headers = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n"
+            f"\r\n"
+        )
+        writer.write(headers.encode('latin-1'))
+        if not head_only:
+            writer.write(payload)
+        await writer.drain()
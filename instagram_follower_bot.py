@@ -3,12 +3,14 @@ Instagram Follow/Unfollow Bot (Clean Mode)
 Только подписки и отписки - без лайков и комментариев
 """
 
+import os
 import time
 import random
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain
 from typing import List, Dict, Optional
-import instagrapi
 from instagrapi import Client
 from instagrapi.exceptions import (
     LoginRequired, 
@@ -16,18 +18,37 @@ from instagrapi.exceptions import (
     PleaseWaitFewMinutes,
     RateLimitError
 )
+from bot_stats import BotStats
+from follower_history import FollowerTimeSeries
+from follower_delta import FollowerDeltaEngine, FollowerDelta, contains
+from friendship_cache import FriendshipCache
+from relationship_archive import RelationshipArchive
+from follow_analytics import load_columns, follow_back_report
+from bot_logging import get_logger, mask_credentials, setup_logging
+
+
+logger = get_logger('follower')
 
 
 class FollowerBot:
     """Бот для накрутки подписчиков через Follow/Unfollow"""
     
-    def __init__(self, username: str, password: str, session_file: str = "session.json", proxy: str = None):
+    # Сколько кандидатов на отписку проверять за один раз
+    FRIENDSHIP_BATCH = 10
+    
+    def __init__(self, username: str, password: str, session_file: str = "session.json", proxy: str = None,
+                 history: Optional[FollowerTimeSeries] = None, archive_after_days: int = 30,
+                 snapshot_interval_hours: float = 24):
         """
         Args:
             username: Instagram username
             password: Instagram password
             session_file: Файл для сохранения сессии
             proxy: Прокси в формате user:pass@host:port (опционально)
+            history: Архив подписчиков (по умолчанию follower_history.rrd)
+            archive_after_days: Через сколько дней после отписки запись уходит в холодный архив
+            snapshot_interval_hours: Не чаще чем раз в столько часов выкачивать полный список
+                подписчиков (для больших аккаунтов это сотни запросов)
         """
         self.username = username
         self.password = password
@@ -36,24 +57,36 @@ class FollowerBot:
         
         # Настройка прокси
         if proxy:
-            print(f"🌐 Using proxy: {proxy}")
+            logger.info(f"🌐 Using proxy: {mask_credentials(proxy)}")
             self.client.set_proxy(proxy)
         
-        # Статистика
-        self.stats = {
-            'followed_today': 0,
-            'unfollowed_today': 0,
-            'followers_gained': 0,
-            'start_followers': 0,
-            'current_followers': 0
-        }
+        # Статистика (потокобезопасная, читается из Telegram контроллера)
+        self.stats = BotStats()
+        
+        # История подписчиков между сессиями (пишется из событий статистики)
+        self.history = history or FollowerTimeSeries()
+        self.stats.subscribe(self.history.on_stats_event)
         
-        # База данных подписок (кого мы подписали)
+        # База данных подписок (кого мы подписали): в памяти только активные,
+        # завершенные старше archive_after_days уходят в холодный архив
+        self.archive_after_days = archive_after_days
+        self.archive = RelationshipArchive()
         self.followed_users = self._load_followed_users()
+        self._archive_finished()
         
         # Whitelist - защита существующих подписок/подписчиков
         self.whitelist = self._load_whitelist()
         
+        # Снимки подписчиков - кто подписался/отписался между сессиями
+        self.follower_deltas = FollowerDeltaEngine()
+        self.snapshot_interval = snapshot_interval_hours * 60 * 60
+        
+        # Кэш проверок "подписан ли на нас" (TTL), чтобы не проверять одних и тех же
+        self.friendships = FriendshipCache()
+        
+        # Отчет по источникам (пересчитывается в конце кампании)
+        self.source_report: Optional[List[Dict]] = None
+        
     def _load_followed_users(self) -> Dict:
         """Загрузить список подписанных пользователей"""
         try:
@@ -64,8 +97,31 @@ class FollowerBot:
     
     def _save_followed_users(self):
         """Сохранить список подписанных пользователей"""
-        with open('followed_users.json', 'w') as f:
+        # Через временный файл - аналитика может читать файл параллельно
+        with open('followed_users.json.tmp', 'w') as f:
             json.dump(self.followed_users, f, indent=2)
+        os.replace('followed_users.json.tmp', 'followed_users.json')
+    
+    def _archive_finished(self):
+        """Перенести давно завершенные подписки из followed_users в холодный архив"""
+        cutoff = (datetime.now() - timedelta(days=self.archive_after_days)).isoformat()
+        
+        # ISO-строки одного формата сравниваются как даты
+        finished = {
+            user_id: data for user_id, data in self.followed_users.items()
+            if data.get('unfollowed') and data.get('unfollowed_at', cutoff) < cutoff
+        }
+        if not finished:
+            return
+        
+        # Сначала архив, потом горячий файл: если упадем между ними, записи
+        # останутся в обоих местах, а повторный append пропустит уже архивные ID
+        self.archive.append(finished)
+        for user_id in finished:
+            del self.followed_users[user_id]
+        self._save_followed_users()
+        
+        logger.info(f"🗄️ Archived {len(finished)} finished relationships ({len(self.followed_users)} active)")
     
     def _load_whitelist(self) -> Dict:
         """Загрузить whitelist (защищенные пользователи)"""
@@ -89,31 +145,104 @@ class FollowerBot:
         Построить whitelist из текущих подписчиков и подписок
         ВАЖНО: Вызывать ОДИН РАЗ при первом запуске!
         """
-        print("🛡️ Building whitelist (protecting existing followers/following)...")
+        logger.info("🛡️ Building whitelist (protecting existing followers/following)...")
         
         try:
             user_id = self.client.user_id_from_username(self.username)
             
             # Получаем всех подписчиков
-            print("📥 Fetching your followers...")
+            logger.info("📥 Fetching your followers...")
             followers = self.client.user_followers(user_id)
             self.whitelist['followers'] = [str(uid) for uid in followers.keys()]
             
+            # Первый снимок подписчиков для расчета дельт
+            self.follower_deltas.update(followers.keys())
+            
             # Получаем всех подписок
-            print("📤 Fetching your following...")
+            logger.info("📤 Fetching your following...")
             following = self.client.user_following(user_id)
             self.whitelist['following'] = [str(uid) for uid in following.keys()]
             
             # Сохраняем
             self._save_whitelist()
             
-            print(f"✅ Whitelist built:")
-            print(f"   - Followers protected: {len(self.whitelist['followers'])}")
-            print(f"   - Following protected: {len(self.whitelist['following'])}")
-            print(f"   - Total protected: {len(self.whitelist['followers']) + len(self.whitelist['following'])}")
+            logger.info(
+                f"✅ Whitelist built: {len(self.whitelist['followers'])} followers, "
+                f"{len(self.whitelist['following'])} following protected",
+                extra={
+                    'event': 'whitelist_built',
+                    'followers': len(self.whitelist['followers']),
+                    'following': len(self.whitelist['following'])
+                }
+            )
             
         except Exception as e:
-            print(f"❌ Error building whitelist: {e}")
+            logger.error(f"❌ Error building whitelist: {e}")
+    
+    def track_follower_changes(self) -> Optional[FollowerDelta]:
+        """
+        Снять новый снимок подписчиков и отметить, кто подписался в ответ
+        
+        Полный список подписчиков - это пагинация на сотни запросов, поэтому
+        снимок обновляется не чаще, чем раз в snapshot_interval.
+        
+        Returns:
+            FollowerDelta или None (первый снимок/снимок еще свежий/ошибка)
+        """
+        taken_at = self.follower_deltas.latest_time()
+        if taken_at is not None and time.time() - taken_at < self.snapshot_interval:
+            hours = (time.time() - taken_at) / 3600
+            logger.info(f"⏭️ Follower snapshot is {hours:.1f}h old, skipping refresh")
+            return None
+        
+        logger.info("🔁 Checking follower changes...")
+        
+        try:
+            user_id = self.client.user_id_from_username(self.username)
+            followers = self.client.user_followers(user_id)
+            delta = self.follower_deltas.update(followers.keys())
+        except Exception as e:
+            logger.error(f"❌ Error checking follower changes: {e}")
+            return None
+        
+        if delta is None:
+            logger.info("✅ First follower snapshot saved")
+            return None
+        
+        now = datetime.now().isoformat()
+        followed_back = 0
+        left = 0
+        
+        # Сопоставляем дельту с теми, на кого подписывался бот
+        for uid in delta.added:
+            data = self.followed_users.get(str(uid))
+            if data is not None and 'followed_back_at' not in data:
+                data['followed_back_at'] = now
+                followed_back += 1
+        
+        for uid in delta.removed:
+            data = self.followed_users.get(str(uid))
+            if data is not None and 'followed_back_at' in data and 'left_at' not in data:
+                data['left_at'] = now
+                left += 1
+        
+        if followed_back or left:
+            self._save_followed_users()
+        if followed_back:
+            self.stats.increment('followed_back_today', followed_back)
+        
+        logger.info(
+            f"✅ Followers: +{len(delta.added)} / -{len(delta.removed)} "
+            f"(followed back: {followed_back}, left after follow-back: {left})",
+            extra={
+                'event': 'follower_delta',
+                'added': len(delta.added),
+                'removed': len(delta.removed),
+                'followed_back': followed_back,
+                'left': left
+            }
+        )
+        return delta
     
     def _is_whitelisted(self, user_id: int) -> bool:
         """
@@ -134,39 +263,39 @@ class FollowerBot:
     
     def login(self):
         """Авторизация в Instagram"""
-        print(f"🔐 Logging in as @{self.username}...")
+        logger.info(f"🔐 Logging in as @{self.username}...")
         
         try:
             # Попытка загрузить сессию
             try:
                 self.client.load_settings(self.session_file)
                 self.client.login(self.username, self.password)
-                print("✅ Logged in using saved session")
+                logger.info("✅ Logged in using saved session")
             except:
                 # Новая авторизация
                 self.client.login(self.username, self.password)
                 self.client.dump_settings(self.session_file)
-                print("✅ Logged in and saved session")
+                logger.info("✅ Logged in and saved session")
             
             # Получаем начальное количество подписчиков
             user_info = self.client.user_info_by_username(self.username)
-            self.stats['start_followers'] = user_info.follower_count
-            self.stats['current_followers'] = user_info.follower_count
+            self.stats.set('start_followers', user_info.follower_count)
+            self.stats.set('current_followers', user_info.follower_count)
             
-            print(f"📊 Current followers: {self.stats['current_followers']}")
+            logger.info(f"📊 Current followers: {user_info.follower_count}")
             
             # Проверяем whitelist
             if not self.whitelist['followers'] and not self.whitelist['following']:
-                print("\n⚠️ Whitelist is empty. Building whitelist to protect existing connections...")
+                logger.warning("⚠️ Whitelist is empty. Building whitelist to protect existing connections...")
                 self._build_whitelist()
             else:
-                print(f"\n🛡️ Whitelist loaded: {len(self.whitelist['followers']) + len(self.whitelist['following'])} users protected")
+                logger.info(f"🛡️ Whitelist loaded: {len(self.whitelist['followers']) + len(self.whitelist['following'])} users protected")
             
         except ChallengeRequired:
-            print("⚠️ Instagram requires verification. Check your email/SMS.")
+            logger.warning("⚠️ Instagram requires verification. Check your email/SMS.")
             raise
         except Exception as e:
-            print(f"❌ Login failed: {e}")
+            logger.error(f"❌ Login failed: {e}")
             raise
     
     def find_target_users(self, target_username: str, limit: int = 50) -> List[int]:
@@ -180,7 +309,7 @@ class FollowerBot:
         Returns:
             Список user_id (исключая whitelist)
         """
-        print(f"🔍 Finding users from @{target_username}...")
+        logger.info(f"🔍 Finding users from @{target_username}...")
         
         try:
             target_user_id = self.client.user_id_from_username(target_username)
@@ -195,11 +324,11 @@ class FollowerBot:
             # Ограничиваем до нужного количества
             user_ids = user_ids[:limit]
             
-            print(f"✅ Found {len(user_ids)} potential targets (excluded {len(followers) - len(user_ids)} whitelisted)")
+            logger.info(f"✅ Found {len(user_ids)} potential targets (excluded {len(followers) - len(user_ids)} whitelisted)")
             return user_ids
             
         except Exception as e:
-            print(f"❌ Error finding users: {e}")
+            logger.error(f"❌ Error finding users: {e}")
             return []
     
     def find_users_by_hashtag(self, hashtag: str, limit: int = 50) -> List[int]:
@@ -213,7 +342,7 @@ class FollowerBot:
         Returns:
             Список user_id (исключая whitelist)
         """
-        print(f"🔍 Finding users by #{hashtag}...")
+        logger.info(f"🔍 Finding users by #{hashtag}...")
         
         try:
             medias = self.client.hashtag_medias_recent(hashtag, amount=limit * 2)  # Берем больше для фильтрации
@@ -229,19 +358,20 @@ class FollowerBot:
             # Ограничиваем до нужного количества
             user_ids = user_ids[:limit]
             
-            print(f"✅ Found {len(user_ids)} users (excluded whitelisted)")
+            logger.info(f"✅ Found {len(user_ids)} users (excluded whitelisted)")
             return user_ids
             
         except Exception as e:
-            print(f"❌ Error finding users: {e}")
+            logger.error(f"❌ Error finding users: {e}")
             return []
     
-    def follow_user(self, user_id: int) -> bool:
+    def follow_user(self, user_id: int, source: Optional[str] = None) -> bool:
         """
         Подписаться на пользователя
         
         Args:
             user_id: ID пользователя
+            source: Откуда пользователь (например 'user:competitor' или 'hashtag:tag')
             
         Returns:
             True если успешно
@@ -249,11 +379,11 @@ class FollowerBot:
         try:
             # Проверяем whitelist (защита существующих связей)
             if self._is_whitelisted(user_id):
-                print(f"🛡️ User {user_id} is whitelisted, skipping...")
+                logger.info(f"🛡️ User {user_id} is whitelisted, skipping...")
                 return False
             
-            # Проверяем, не подписаны ли уже
-            if str(user_id) in self.followed_users:
+            # Проверяем, не подписаны ли уже (в том числе давно, см. архив)
+            if str(user_id) in self.followed_users or self.archive.contains(user_id):
                 return False
             
             # Подписываемся
@@ -262,23 +392,25 @@ class FollowerBot:
             # Сохраняем в базу
             self.followed_users[str(user_id)] = {
                 'followed_at': datetime.now().isoformat(),
-                'unfollowed': False
+                'unfollowed': False,
+                'source': source
             }
             self._save_followed_users()
             
-            self.stats['followed_today'] += 1
+            self.stats.increment('followed_today')
             
             user_info = self.client.user_info(user_id)
-            print(f"✅ Followed @{user_info.username}")
+            logger.info(f"✅ Followed @{user_info.username}",
+                        extra={'event': 'follow', 'user_id': str(user_id), 'source': source})
             
             return True
             
         except PleaseWaitFewMinutes:
-            print("⚠️ Rate limit! Waiting 5 minutes...")
+            logger.warning("⚠️ Rate limit! Waiting 5 minutes...")
             time.sleep(300)
             return False
         except Exception as e:
-            print(f"❌ Follow error: {e}")
+            logger.error(f"❌ Follow error: {e}")
             return False
     
     def unfollow_user(self, user_id: int) -> bool:
@@ -294,7 +426,7 @@ class FollowerBot:
         try:
             # КРИТИЧЕСКАЯ ЗАЩИТА: НИКОГДА не отписываемся от whitelist
             if self._is_whitelisted(user_id):
-                print(f"🛡️ User {user_id} is whitelisted, NEVER unfollowing!")
+                logger.info(f"🛡️ User {user_id} is whitelisted, NEVER unfollowing!")
                 return False
             
             self.client.user_unfollow(user_id)
@@ -305,15 +437,16 @@ class FollowerBot:
                 self.followed_users[str(user_id)]['unfollowed_at'] = datetime.now().isoformat()
                 self._save_followed_users()
             
-            self.stats['unfollowed_today'] += 1
+            self.stats.increment('unfollowed_today')
             
             user_info = self.client.user_info(user_id)
-            print(f"➖ Unfollowed @{user_info.username}")
+            logger.info(f"➖ Unfollowed @{user_info.username}",
+                        extra={'event': 'unfollow', 'user_id': str(user_id)})
             
             return True
             
         except Exception as e:
-            print(f"❌ Unfollow error: {e}")
+            logger.error(f"❌ Unfollow error: {e}")
             return False
     
     def unfollow_non_followers(self, days_ago: int = 3, limit: int = 50):
@@ -324,15 +457,13 @@ class FollowerBot:
             days_ago: Отписываться от тех, кого подписали N дней назад
             limit: Максимум отписок
         """
-        print(f"\n🔄 Unfollowing users who didn't follow back (>{days_ago} days)...")
+        logger.info(f"🔄 Unfollowing users who didn't follow back (>{days_ago} days)...")
         
         cutoff_date = datetime.now() - timedelta(days=days_ago)
         unfollowed_count = 0
         
+        candidates = []
         for user_id, data in list(self.followed_users.items()):
-            if unfollowed_count >= limit:
-                break
-            
             # Пропускаем уже отписанных
             if data.get('unfollowed', False):
                 continue
@@ -347,24 +478,116 @@ class FollowerBot:
             if followed_at > cutoff_date:
                 continue
             
-            # Проверяем, подписан ли пользователь на нас
-            try:
-                friendship = self.client.user_friendship(user_id_int)
+            candidates.append(user_id_int)
+        
+        # Свежий снимок подписчиков отвечает на вопрос "подписан ли" без запросов
+        snapshot = self.follower_deltas.latest_with_time()
+        if snapshot and time.time() - snapshot[0] > self.friendships.ttl:
+            snapshot = None
+        followers = snapshot[1] if snapshot else None
+        
+        batches = [
+            candidates[i:i + self.FRIENDSHIP_BATCH]
+            for i in range(0, len(candidates), self.FRIENDSHIP_BATCH)
+        ]
+        self._friendship_requests = 0
+        
+        # Один фоновый поток: проверки следующей пачки идут во время паузы между отписками,
+        # а основной поток ждет результат до следующего запроса (клиент не используется параллельно)
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            future = prefetch.submit(self._resolve_followed_by, batches[0], followers) if batches else None
+            
+            for index, batch in enumerate(batches):
+                if unfollowed_count >= limit:
+                    break
+                
+                followed_by = future.result()
+                future = None
+                next_batch = batches[index + 1] if index + 1 < len(batches) else None
                 
                 # Если не подписан на нас - отписываемся
-                if not friendship.followed_by:
-                    self.unfollow_user(user_id_int)
+                to_unfollow = [uid for uid in batch if followed_by.get(uid) is False]
+                to_unfollow = to_unfollow[:limit - unfollowed_count]
+                
+                for position, user_id_int in enumerate(to_unfollow):
+                    if self.unfollow_user(user_id_int):
+                        self.friendships.invalidate(user_id_int)
                     unfollowed_count += 1
                     
+                    # Перед последней паузой пачки запускаем проверку следующей
+                    if position == len(to_unfollow) - 1 and next_batch and unfollowed_count < limit:
+                        future = prefetch.submit(self._resolve_followed_by, next_batch, followers)
+                    
                     # Задержка между отписками
                     delay = random.randint(30, 60)
                     time.sleep(delay)
-                    
-            except Exception as e:
-                print(f"⚠️ Error checking user {user_id}: {e}")
+                
+                if future is None and next_batch and unfollowed_count < limit:
+                    future = prefetch.submit(self._resolve_followed_by, next_batch, followers)
+            
+            if future is not None:
+                future.result()
+        
+        self.friendships.save()
+        
+        logger.info(
+            f"✅ Unfollowed {unfollowed_count} users "
+            f"({self._friendship_requests} status requests for {len(candidates)} candidates)",
+            extra={
+                'event': 'unfollow_pass',
+                'unfollowed': unfollowed_count,
+                'status_requests': self._friendship_requests,
+                'candidates': len(candidates)
+            }
+        )
+    
+    def _resolve_followed_by(self, user_ids: List[int], followers=None) -> Dict[int, Optional[bool]]:
+        """
+        Узнать, подписаны ли пользователи на нас: кэш -> снимок подписчиков -> запрос
+        
+        Args:
+            user_ids: Пачка пользователей
+            followers: Свежий отсортированный снимок подписчиков (или None)
+            
+        Returns:
+            {user_id: True/False, None - не удалось проверить}
+        """
+        result = {}
+        for user_id in user_ids:
+            cached = self.friendships.get(user_id)
+            if cached is not None:
+                result[user_id] = cached
                 continue
+            
+            if followers is not None:
+                result[user_id] = contains(followers, user_id)
+                continue
+            
+            try:
+                self._friendship_requests += 1
+                friendship = self.client.user_friendship(user_id)
+                self.friendships.set(user_id, friendship.followed_by)
+                result[user_id] = friendship.followed_by
+            except Exception as e:
+                logger.warning(f"⚠️ Error checking user {user_id}: {e}")
+                result[user_id] = None
+        
+        return result
+    
+    @staticmethod
+    def _normalize_source(source) -> Dict:
+        """
+        Привести источник к виду {'type': ..., 'value': ...}
+        
+        Строки (как в bot_config.json): '#tag' - хештег, иначе username
+        """
+        if isinstance(source, dict):
+            return source
         
-        print(f"✅ Unfollowed {unfollowed_count} users")
+        value = str(source).strip()
+        if value.startswith('#'):
+            return {'type': 'hashtag', 'value': value[1:]}
+        return {'type': 'user', 'value': value.lstrip('@')}
     
     def run_follow_campaign(self, 
                            target_sources: List[Dict],
@@ -376,69 +599,77 @@ class FollowerBot:
         Args:
             target_sources: Список источников целевой аудитории
                 [{'type': 'user', 'value': 'username'}, {'type': 'hashtag', 'value': 'tag'}]
+                или строки: 'username' / '#tag'
             follows_per_session: Сколько подписок за сессию
             delay_range: Диапазон задержки между подписками (сек)
         """
-        print(f"\n🚀 Starting follow campaign...")
-        print(f"Target: {follows_per_session} follows")
+        logger.info(f"🚀 Starting follow campaign: {follows_per_session} follows",
+                    extra={'event': 'campaign_start', 'target': follows_per_session})
         
         all_targets = []
         
-        # Собираем целевых пользователей из всех источников
-        for source in target_sources:
+        # Собираем целевых пользователей из всех источников (вместе с меткой источника)
+        for source in map(self._normalize_source, target_sources):
+            label = f"{source['type']}:{source['value']}"
             if source['type'] == 'user':
                 users = self.find_target_users(source['value'], limit=100)
-                all_targets.extend(users)
+                all_targets.extend((uid, label) for uid in users)
             elif source['type'] == 'hashtag':
                 users = self.find_users_by_hashtag(source['value'], limit=100)
-                all_targets.extend(users)
+                all_targets.extend((uid, label) for uid in users)
         
         # Перемешиваем и берем нужное количество
         random.shuffle(all_targets)
         all_targets = all_targets[:follows_per_session]
         
-        print(f"📋 Total targets collected: {len(all_targets)}")
+        logger.info(f"📋 Total targets collected: {len(all_targets)}")
         
         # Подписываемся
         followed_count = 0
-        for user_id in all_targets:
-            if self.follow_user(user_id):
+        for user_id, label in all_targets:
+            if self.follow_user(user_id, source=label):
                 followed_count += 1
                 
                 # Случайная задержка
                 delay = random.randint(delay_range[0], delay_range[1])
-                print(f"⏳ Waiting {delay}s...")
+                logger.info(f"⏳ Waiting {delay}s...")
                 time.sleep(delay)
         
-        print(f"\n✅ Campaign finished! Followed {followed_count} users")
+        logger.info(f"✅ Campaign finished! Followed {followed_count} users",
+                    extra={'event': 'campaign_finish', 'followed': followed_count})
+        self.refresh_followers()
+        self.track_follower_changes()
+        self._archive_finished()
+        self.source_report = follow_back_report(
+            load_columns(chain(self.followed_users.items(), self.archive.scan()))
+        )
         self.print_stats()
     
-    def print_stats(self):
-        """Вывести статистику"""
-        # Обновляем текущее количество подписчиков
+    def refresh_followers(self):
+        """Обновить текущее количество подписчиков (сетевой запрос)"""
         try:
             user_info = self.client.user_info_by_username(self.username)
-            self.stats['current_followers'] = user_info.follower_count
-            self.stats['followers_gained'] = (
-                self.stats['current_followers'] - self.stats['start_followers']
-            )
-        except:
-            pass
-        
-        print("\n" + "="*50)
-        print("📊 SESSION STATISTICS")
-        print("="*50)
-        print(f"Followed today: {self.stats['followed_today']}")
-        print(f"Unfollowed today: {self.stats['unfollowed_today']}")
-        print(f"Start followers: {self.stats['start_followers']}")
-        print(f"Current followers: {self.stats['current_followers']}")
-        print(f"Gained: +{self.stats['followers_gained']}")
-        print("="*50 + "\n")
+            self.stats.set('current_followers', user_info.follower_count)
+        except Exception as e:
+            logger.warning(f"⚠️ Error refreshing followers: {e}")
+    
+    def print_stats(self):
+        """Вывести статистику (из снимка, без сетевых запросов)"""
+        stats = self.stats.snapshot()
+        
+        logger.info(
+            f"📊 Session: followed {stats['followed_today']}, unfollowed {stats['unfollowed_today']}, "
+            f"followed back {stats['followed_back_today']}, followers "
+            f"{stats['start_followers']} -> {stats['current_followers']} (+{stats['followers_gained']})",
+            extra={'event': 'session_stats', 'stats': stats}
+        )
 
 
 def main():
     """Пример использования"""
     
+    setup_logging()
+    
     print("="*60)
     print("Instagram Follow/Unfollow Bot (Clean Mode)")
     print("="*60)
@@ -0,0 +1,159 @@
+"""
+Холодный архив завершенных подписок
+Сжатый append-only JSONL (gzip member на каждую пачку) + отсортированный индекс ID
+Недописанный последний member (сбой во время записи) при чтении игнорируется
+"""
+
+import gzip
+import json
+import os
+import zlib
+from array import array
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from follower_delta import contains, to_sorted_array
+
+
+# Размер блока при потоковом чтении архива
+READ_SIZE = 1 << 16
+
+
+class RelationshipArchive:
+    """Архив отписанных пользователей: читается потоком, в память грузятся только ID"""
+
+    def __init__(self, path: str = 'followed_users.archive.jsonl.gz',
+                 ids_path: str = 'followed_users.archive.ids'):
+        """
+        Args:
+            path: Сжатый архив записей
+            ids_path: Отсортированный массив int64 с ID из архива
+        """
+        self.path = path
+        self.ids_path = ids_path
+        self._ids: Optional[array] = None
+
+    @property
+    def ids(self) -> array:
+        """Отсортированные ID из архива (грузятся при первом обращении)"""
+        if self._ids is None:
+            if self._index_is_stale():
+                self._rebuild_index()
+            else:
+                self._ids = array('q')
+                if os.path.exists(self.ids_path):
+                    with open(self.ids_path, 'rb') as f:
+                        self._ids.frombytes(f.read())
+        return self._ids
+
+    def _index_is_stale(self) -> bool:
+        """Индекс старше архива - процесс упал между записью пачки и индекса"""
+        if not os.path.exists(self.path):
+            return False
+        if not os.path.exists(self.ids_path):
+            return True
+        return os.stat(self.ids_path).st_mtime_ns < os.stat(self.path).st_mtime_ns
+
+    def _rebuild_index(self):
+        """Пересобрать индекс ID потоковым чтением архива, отрезав недописанный хвост"""
+        ids = []
+        end = 0
+        for end, lines in self._members():
+            ids.extend(json.loads(line)['id'] for line in lines)
+
+        # Сбой посреди записи пачки: ее записи еще в followed_users, хвост не нужен
+        if os.path.getsize(self.path) > end:
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+
+        self._write_index(to_sorted_array(ids))
+
+    def _write_index(self, ids: array):
+        """Атомарно записать индекс"""
+        with open(self.ids_path + '.tmp', 'wb') as f:
+            ids.tofile(f)
+        os.replace(self.ids_path + '.tmp', self.ids_path)
+        self._ids = ids
+
+    def contains(self, user_id) -> bool:
+        """Есть ли пользователь в архиве (бинарный поиск по индексу)"""
+        return contains(self.ids, int(user_id))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, records: Dict[str, Dict]):
+        """
+        Дописать записи в архив
+
+        Args:
+            records: {user_id: запись из followed_users}
+
+        ID, которые уже есть в архиве, пропускаются: повторный перенос
+        после сбоя не создает дублей
+        """
+        records = {
+            user_id: data for user_id, data in records.items()
+            if not self.contains(user_id)
+        }
+        if not records:
+            return
+
+        # Каждая пачка - отдельный gzip member, gzip читает их подряд как один поток.
+        # Member сжимается в памяти и пишется одним write + fsync
+        member = gzip.compress(''.join(
+            json.dumps({'id': user_id, **data}) + '\n' for user_id, data in records.items()
+        ).encode('utf-8'))
+        with open(self.path, 'ab') as f:
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._write_index(to_sorted_array(chain(self.ids, records)))
+
+    def scan(self) -> Iterator[Tuple[str, Dict]]:
+        """Потоково прочитать архив: пары (user_id, запись)"""
+        for line in self.scan_lines():
+            data = json.loads(line)
+            yield data.pop('id'), data
+
+    def scan_lines(self) -> Iterator[str]:
+        """Потоково прочитать архив как есть: JSON-строки {"id": ..., ...} без разбора"""
+        for _, lines in self._members():
+            yield from lines
+
+    def _members(self) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Потоково прочитать целые gzip member'ы архива
+
+        Yields:
+            (смещение конца member'а в файле, строки member'а).
+            Недописанный или битый хвост файла считается концом архива
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+            parts = []
+            read = 0
+            while True:
+                data = f.read(READ_SIZE)
+                if not data:
+                    return
+                read += len(data)
+
+                while data:
+                    try:
+                        parts.append(decompressor.decompress(data))
+                    except zlib.error:
+                        return
+                    if not decompressor.eof:
+                        break
+
+                    # Member закончился, в unused_data - начало следующего
+                    data = decompressor.unused_data
+                    lines = b''.join(parts).decode('utf-8').split('\n')
+                    yield read - len(data), [line for line in lines if line]
+                    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+                    parts = []
@@ -9,6 +9,10 @@ import json
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
+from bot_logging import get_logger, setup_logging
+
+
+logger = get_logger('smm')
 
 
 class ServiceType(Enum):
@@ -82,7 +86,7 @@ class SMMPanelClient:
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
-            print(f"❌ API request failed: {e}")
+            logger.error(f"❌ API request failed: {e}")
             return {'error': str(e)}
     
     def get_balance(self) -> float:
@@ -167,7 +171,7 @@ class SMMPanelClient:
         if 'order' in result:
             return str(result['order'])
         elif 'error' in result:
-            print(f"❌ Order creation failed: {result['error']}")
+            logger.error(f"❌ Order creation failed: {result['error']}")
         
         return None
     
@@ -256,32 +260,39 @@ class InstagramBooster:
         )
         
         if not service:
-            print("❌ Service not found")
+            logger.error("❌ Service not found")
             return None
         
         service_id = service['service']
         price_per_1000 = float(service['rate'])
         total_cost = (count / 1000) * price_per_1000
         
-        print(f"📊 Service: {service['name']}")
-        print(f"💰 Price: ${price_per_1000} per 1000")
-        print(f"💵 Total cost: ${total_cost:.2f}")
-        print(f"📦 Quantity: {count}")
+        logger.info(
+            f"📊 Service: {service['name']}, ${price_per_1000} per 1000, "
+            f"{count} pcs, total ${total_cost:.2f}",
+            extra={
+                'event': 'order_quote',
+                'service_id': service_id,
+                'quantity': count,
+                'total_cost': total_cost
+            }
+        )
         
         # Проверяем баланс
         balance = self.client.get_balance()
-        print(f"💳 Your balance: ${balance:.2f}")
+        logger.info(f"💳 Your balance: ${balance:.2f}")
         
         if balance < total_cost:
-            print(f"❌ Insufficient balance! Need ${total_cost - balance:.2f} more")
+            logger.error(f"❌ Insufficient balance! Need ${total_cost - balance:.2f} more")
             return None
         
         # Создаем заказ
-        print(f"\n🚀 Creating order...")
+        logger.info(f"🚀 Creating order...")
         order_id = self.client.create_order(service_id, profile_link, count)
         
         if order_id:
-            print(f"✅ Order created! ID: {order_id}")
+            logger.info(f"✅ Order created! ID: {order_id}",
+                        extra={'event': 'order_created', 'order_id': order_id})
             return order_id
         
         return None
@@ -294,8 +305,7 @@ class InstagramBooster:
             order_id: ID заказа
             check_interval: Интервал проверки в секундах
         """
-        print(f"\n📊 Tracking order {order_id}...")
-        print("Press Ctrl+C to stop tracking\n")
+        logger.info(f"📊 Tracking order {order_id}... (Ctrl+C to stop)")
         
         try:
             while True:
@@ -305,25 +315,33 @@ class InstagramBooster:
                     completed = status.start_count - status.remains
                     progress = (completed / status.start_count * 100) if status.start_count > 0 else 0
                     
-                    print(f"Status: {status.status}")
-                    print(f"Progress: {completed}/{status.start_count} ({progress:.1f}%)")
-                    print(f"Remains: {status.remains}")
-                    print(f"Current count: {status.currency_count}")
-                    print("-" * 50)
+                    logger.info(
+                        f"Status: {status.status}, progress {completed}/{status.start_count} "
+                        f"({progress:.1f}%), remains {status.remains}, current {status.currency_count}",
+                        extra={
+                            'event': 'order_status',
+                            'order_id': order_id,
+                            'status': status.status,
+                            'remains': status.remains,
+                            'current': status.currency_count
+                        }
+                    )
                     
                     if status.status.lower() in ['completed', 'partial', 'canceled']:
-                        print(f"\n✅ Order finished with status: {status.status}")
+                        logger.info(f"✅ Order finished with status: {status.status}")
                         break
                 
                 time.sleep(check_interval)
                 
         except KeyboardInterrupt:
-            print("\n⏸️ Tracking stopped by user")
+            logger.info("⏸️ Tracking stopped by user")
 
 
 def main():
     """Пример использования"""
     
+    setup_logging()
+    
     print("=" * 60)
     print("Instagram SMM Panel Booster")
     print("=" * 60)
@@ -0,0 +1,459 @@
+"""
+Потоковый экспорт/импорт состояния бота (бэкап и перенос)
+Формат: заголовок IGST + кадры [длина uint32][zlib(NDJSON записей)]
+
+Использование:
+    python state_transfer.py export backup.igst
+    python state_transfer.py import backup.igst --force
+
+Оба направления можно прервать и запустить снова - работа продолжится
+с последнего записанного кадра (--restart - начать заново).
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import struct
+import zlib
+from array import array
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, Optional
+
+from relationship_archive import RelationshipArchive
+from bot_logging import get_logger, setup_logging
+
+
+logger = get_logger('transfer')
+
+MAGIC = b'IGST'
+VERSION = 1
+HEADER = struct.Struct('>4sH')
+FRAME_LEN = struct.Struct('>I')
+
+# Записей в одном кадре - ограничивает память и шаг возобновления
+CHUNK_RECORDS = 20000
+
+# Файлы состояния (относительно base_dir)
+FOLLOWED_USERS = 'followed_users.json'
+ARCHIVE = 'followed_users.archive.jsonl.gz'
+ARCHIVE_IDS = 'followed_users.archive.ids'
+WHITELIST = 'whitelist.json'
+CONFIG = 'bot_config.json'
+
+# Папка для частично импортированного состояния
+STAGING = '.state_import'
+
+# Типы записей: meta, rel (активная подписка), arc (архив), wl (whitelist), cfg (конфиг)
+WHITELIST_LISTS = ('followers', 'following', 'custom')
+
+# Записи rel/arc начинаются так (json.dumps с порядком ключей t, id) - по префиксу
+# их можно переложить без полного разбора JSON
+_FAST_PREFIXES = {
+    'rel': '{"t": "rel", "id": "',
+    'arc': '{"t": "arc", "id": "',
+}
+
+
+def _load_json(path: str, default):
+    """Прочитать JSON-файл состояния (или default, если файла нет)"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def _save_progress(path: str, progress: Dict):
+    """Атомарно записать чекпоинт"""
+    with open(path + '.tmp', 'w') as f:
+        json.dump(progress, f)
+    os.replace(path + '.tmp', path)
+
+
+def _source_stamp(base_dir: str) -> Dict:
+    """Размер и mtime файлов, из которых читает экспорт (None - файла нет)"""
+    stamp = {}
+    for name in (FOLLOWED_USERS, ARCHIVE, WHITELIST, CONFIG):
+        try:
+            st = os.stat(os.path.join(base_dir, name))
+            stamp[name] = [st.st_size, st.st_mtime_ns]
+        except FileNotFoundError:
+            stamp[name] = None
+    return stamp
+
+
+def _backup_stamp(path: str) -> list:
+    """Путь, размер и mtime файла бэкапа, из которого идет импорт"""
+    st = os.stat(path)
+    return [os.path.abspath(path), st.st_size, st.st_mtime_ns]
+
+
+def _dumps(record: Dict) -> str:
+    return json.dumps(record, ensure_ascii=False)
+
+
+def iter_state_lines(base_dir: str = '.') -> Iterator[str]:
+    """
+    Все записи состояния (JSON-строки) в детерминированном порядке
+
+    Активные подписки читаются целиком (завершенные давно ушли в архив),
+    архив - потоком и без разбора JSON.
+    """
+    yield _dumps({'t': 'meta', 'version': VERSION, 'created': datetime.now().isoformat()})
+
+    followed_users = _load_json(os.path.join(base_dir, FOLLOWED_USERS), {})
+    for user_id, data in followed_users.items():
+        yield _dumps({'t': 'rel', 'id': str(user_id), **data})
+    del followed_users
+
+    archive = RelationshipArchive(os.path.join(base_dir, ARCHIVE), os.path.join(base_dir, ARCHIVE_IDS))
+    for line in archive.scan_lines():
+        # {"id": ...} -> {"t": "arc", "id": ...}
+        yield '{"t": "arc", ' + line[1:]
+
+    whitelist = _load_json(os.path.join(base_dir, WHITELIST), {})
+    for name, user_ids in whitelist.items():
+        for user_id in user_ids:
+            yield _dumps({'t': 'wl', 'list': name, 'id': user_id})
+    del whitelist
+
+    config = _load_json(os.path.join(base_dir, CONFIG), None)
+    if config is not None:
+        yield _dumps({'t': 'cfg', 'data': config})
+
+
+def export_state(out_path: str, base_dir: str = '.', resume: bool = True) -> int:
+    """
+    Экспортировать состояние в файл
+
+    Args:
+        out_path: Файл бэкапа
+        base_dir: Папка с файлами состояния бота
+        resume: Продолжить прерванный экспорт (по out_path + '.progress').
+            Если файлы состояния с тех пор изменились, экспорт начинается заново
+
+    Returns:
+        Сколько записей в бэкапе
+    """
+    progress_path = out_path + '.progress'
+    progress = _load_json(progress_path, None) if resume else None
+    source = _source_stamp(base_dir)
+
+    # Пропуск уже выгруженных записей верен, только если состояние не менялось
+    if progress and progress.get('source') != source:
+        logger.warning("⚠️ State changed since the interrupted export - starting over")
+        progress = None
+
+    if progress and os.path.exists(out_path):
+        # Отрезаем недописанный кадр и пропускаем уже выгруженные записи
+        f = open(out_path, 'r+b')
+        f.truncate(progress['bytes'])
+        f.seek(progress['bytes'])
+        done = progress['records']
+        logger.info(f"⏯️ Resuming export after {done} records")
+    else:
+        f = open(out_path, 'wb')
+        f.write(HEADER.pack(MAGIC, VERSION))
+        done = 0
+
+    with f:
+        lines = islice(iter_state_lines(base_dir), done, None)
+        while True:
+            chunk = list(islice(lines, CHUNK_RECORDS))
+            if not chunk:
+                break
+
+            payload = zlib.compress('\n'.join(chunk).encode('utf-8'), 1)
+            f.write(FRAME_LEN.pack(len(payload)))
+            f.write(payload)
+            f.flush()
+
+            done += len(chunk)
+            _save_progress(progress_path, {'records': done, 'bytes': f.tell(), 'source': source})
+
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+
+    logger.info(f"📦 Exported {done} records to {out_path}",
+                extra={'event': 'state_export', 'records': done})
+    return done
+
+
+def iter_frames(f, offset: int) -> Iterator[tuple]:
+    """
+    Читать кадры бэкапа начиная с offset
+
+    Yields:
+        (смещение после кадра, список JSON-строк записей)
+    """
+    f.seek(offset)
+    while True:
+        head = f.read(FRAME_LEN.size)
+        if not head:
+            return
+        if len(head) < FRAME_LEN.size:
+            raise ValueError("Truncated backup: incomplete frame header")
+
+        (length,) = FRAME_LEN.unpack(head)
+        payload = f.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated backup: incomplete frame")
+
+        lines = zlib.decompress(payload).decode('utf-8').split('\n')
+        yield f.tell(), [line for line in lines if line]
+
+
+def import_state(in_path: str, base_dir: str = '.', resume: bool = True,
+                 overwrite: bool = False) -> int:
+    """
+    Импортировать состояние из бэкапа
+
+    Данные сначала пишутся в папку STAGING и переносятся на место только
+    в конце, поэтому прерванный импорт не портит текущее состояние.
+    Сбой во время переноса тоже можно продолжить (фаза finalizing).
+    С overwrite файлы состояния, которых нет в бэкапе, удаляются.
+
+    Args:
+        in_path: Файл бэкапа
+        base_dir: Папка, куда восстановить состояние
+        resume: Продолжить прерванный импорт
+        overwrite: Разрешить перезапись существующих файлов состояния
+
+    Returns:
+        Сколько записей импортировано
+    """
+    staging = os.path.join(base_dir, STAGING)
+    progress_path = os.path.join(staging, 'progress.json')
+    parts = {
+        'rel': os.path.join(staging, 'followed_users.part'),
+        'arc': os.path.join(staging, 'archive.part'),
+        'ids': os.path.join(staging, 'archive_ids.part'),
+        'wl': os.path.join(staging, 'whitelist.part'),
+        'cfg': os.path.join(staging, 'config.part'),
+    }
+
+    progress = _load_json(progress_path, None) if resume else None
+    source = _backup_stamp(in_path)
+
+    # Смещения в progress.json имеют смысл только для того же файла бэкапа
+    if progress and progress.get('source') != source:
+        logger.warning("⚠️ Interrupted import was from a different backup - starting over")
+        progress = None
+
+    if progress and progress.get('phase') == 'finalizing':
+        # Все кадры уже разложены, часть файлов могла быть перенесена на место
+        logger.info(f"⏯️ Resuming import finalization ({progress['records']} records)")
+    elif progress:
+        # Отрезаем все, что было записано после последнего чекпоинта
+        for name, path in parts.items():
+            with open(path, 'r+b') as part:
+                part.truncate(progress['sizes'][name])
+        logger.info(f"⏯️ Resuming import after {progress['records']} records")
+    else:
+        targets = (FOLLOWED_USERS, ARCHIVE, ARCHIVE_IDS, WHITELIST, CONFIG)
+        existing = [t for t in targets if os.path.exists(os.path.join(base_dir, t))]
+        if existing and not overwrite:
+            raise FileExistsError(f"State files already exist: {', '.join(existing)}")
+
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for path in parts.values():
+            open(path, 'wb').close()
+        progress = {'offset': HEADER.size, 'records': 0, 'relationships': 0, 'sizes': {},
+                    'source': source}
+
+    if progress.get('phase') != 'finalizing':
+        _import_frames(in_path, parts, progress, progress_path)
+        progress['phase'] = 'finalizing'
+        _save_progress(progress_path, progress)
+
+    _finalize_import(base_dir, parts, progress)
+    shutil.rmtree(staging)
+
+    logger.info(f"📥 Imported {progress['records']} records from {in_path}",
+                extra={'event': 'state_import', 'records': progress['records']})
+    return progress['records']
+
+
+def _import_frames(in_path: str, parts: Dict[str, str], progress: Dict, progress_path: str):
+    """Разложить кадры бэкапа (с progress['offset']) по staging-файлам с чекпоинтами"""
+    files = {name: open(path, 'ab') for name, path in parts.items()}
+    try:
+        with open(in_path, 'rb') as f:
+            magic, version = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version > VERSION:
+                raise ValueError(f"Unsupported backup format: {in_path}")
+
+            for offset, records in iter_frames(f, progress['offset']):
+                _import_chunk(records, files, progress)
+
+                for part in files.values():
+                    part.flush()
+                progress['offset'] = offset
+                progress['records'] += len(records)
+                progress['sizes'] = {name: part.tell() for name, part in files.items()}
+                _save_progress(progress_path, progress)
+    finally:
+        for part in files.values():
+            part.close()
+
+
+def _split_fast(line: str, kind: str) -> Optional[tuple]:
+    """
+    Быстро разобрать строку rel/arc без json.loads
+
+    Returns:
+        (user_id, JSON остальных полей) или None, если строка другого вида
+    """
+    prefix = _FAST_PREFIXES[kind]
+    if not line.startswith(prefix):
+        return None
+
+    end = line.find('"', len(prefix))
+    user_id = line[len(prefix):end]
+    rest = line[end + 1:]
+    if not user_id.isdigit():
+        return None
+
+    # rest: ', "field": ...}' или '}'
+    if rest == '}':
+        return user_id, '{}'
+    if rest.startswith(', '):
+        return user_id, '{' + rest[2:]
+    return None
+
+
+def _import_chunk(lines, files: Dict, progress: Dict):
+    """Разложить записи одного кадра по staging-файлам"""
+    archived = []
+    archived_ids = array('q')
+
+    for line in lines:
+        # '{"t": "rel", ...' -> 'rel'
+        kind = line[7:10] if line.startswith('{"t": "') else None
+        fast = _split_fast(line, kind) if kind in _FAST_PREFIXES else None
+
+        if fast:
+            user_id, body = fast
+        else:
+            record = json.loads(line)
+            kind = record.pop('t')
+            if kind in _FAST_PREFIXES:
+                user_id = str(record.pop('id'))
+                body = _dumps(record)
+
+        if kind == 'rel':
+            # Тело JSON-объекта followed_users пишется потоком, скобки - в конце
+            separator = ',\n' if progress['relationships'] else '\n'
+            files['rel'].write(f'{separator}{json.dumps(user_id)}: {body}'.encode('utf-8'))
+            progress['relationships'] += 1
+
+        elif kind == 'arc':
+            # Формат строки архива: {"id": ..., <поля>}
+            head = '{"id": ' + json.dumps(user_id)
+            archived.append(head + '}' if body == '{}' else head + ', ' + body[1:])
+            archived_ids.append(int(user_id))
+
+        elif kind == 'wl':
+            files['wl'].write((_dumps([record['list'], record['id']]) + '\n').encode('utf-8'))
+
+        elif kind == 'cfg':
+            files['cfg'].seek(0)
+            files['cfg'].truncate()
+            files['cfg'].write(json.dumps(record['data'], indent=2).encode('utf-8'))
+
+        elif kind == 'meta':
+            if record.get('version', 0) > VERSION:
+                raise ValueError(f"Backup version {record['version']} is newer than supported")
+
+    if archived:
+        # Формат как у RelationshipArchive: gzip member на пачку
+        files['arc'].write(gzip.compress(('\n'.join(archived) + '\n').encode('utf-8'), compresslevel=6))
+        archived_ids.tofile(files['ids'])
+
+
+def _remove(path: str):
+    """Удалить файл, если он есть"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _finalize_import(base_dir: str, parts: Dict[str, str], progress: Dict):
+    """
+    Собрать итоговые файлы из staging и атомарно переложить на место
+
+    Идемпотентно: при повторном запуске после сбоя уже перенесенные части
+    пропускаются (их наличие в бэкапе берется из progress['sizes']).
+    Файлы, которых нет в бэкапе, удаляются - остатков старого состояния не будет.
+    """
+    # followed_users.json: {<тело>}
+    target = os.path.join(base_dir, FOLLOWED_USERS)
+    with open(target + '.tmp', 'wb') as out, open(parts['rel'], 'rb') as body:
+        out.write(b'{')
+        shutil.copyfileobj(body, out)
+        out.write(b'\n}\n')
+    os.replace(target + '.tmp', target)
+
+    sizes = progress['sizes']
+
+    # Архив + отсортированный индекс ID (индекс переносится последним,
+    # чтобы он не оказался старше архива - см. RelationshipArchive.ids)
+    if sizes.get('arc'):
+        if os.path.exists(parts['ids']):
+            ids = array('q')
+            with open(parts['ids'], 'rb') as f:
+                ids.frombytes(f.read())
+            ids = array('q', sorted(ids))
+            with open(parts['ids'] + '.tmp', 'wb') as f:
+                ids.tofile(f)
+            os.replace(parts['ids'] + '.tmp', parts['ids'])
+        if os.path.exists(parts['arc']):
+            os.replace(parts['arc'], os.path.join(base_dir, ARCHIVE))
+        if os.path.exists(parts['ids']):
+            os.replace(parts['ids'], os.path.join(base_dir, ARCHIVE_IDS))
+    else:
+        _remove(os.path.join(base_dir, ARCHIVE))
+        _remove(os.path.join(base_dir, ARCHIVE_IDS))
+
+    # Whitelist (бот все равно держит его в памяти целиком)
+    whitelist = {name: [] for name in WHITELIST_LISTS}
+    with open(parts['wl'], 'r', encoding='utf-8') as f:
+        for line in f:
+            name, user_id = json.loads(line)
+            whitelist.setdefault(name, []).append(user_id)
+    target = os.path.join(base_dir, WHITELIST)
+    with open(target + '.tmp', 'w') as f:
+        json.dump(whitelist, f, indent=2)
+    os.replace(target + '.tmp', target)
+
+    if not sizes.get('cfg'):
+        _remove(os.path.join(base_dir, CONFIG))
+    elif os.path.exists(parts['cfg']):
+        os.replace(parts['cfg'], os.path.join(base_dir, CONFIG))
+
+
+def main():
+    """CLI: export/import"""
+    parser = argparse.ArgumentParser(description="Экспорт/импорт состояния Instagram бота")
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('path', help="Файл бэкапа")
+    parser.add_argument('--dir', default='.', help="Папка с файлами состояния")
+    parser.add_argument('--restart', action='store_true', help="Не продолжать прерванную операцию")
+    parser.add_argument('--force', action='store_true', help="Перезаписать существующее состояние при импорте")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    if args.command == 'export':
+        export_state(args.path, base_dir=args.dir, resume=not args.restart)
+    else:
+        import_state(args.path, base_dir=args.dir, resume=not args.restart, overwrite=args.force)
+
+
+if __name__ == "__main__":
+    main()
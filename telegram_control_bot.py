@@ -7,8 +7,9 @@ import os
 import json
 import asyncio
 from datetime import datetime
-from typing import Optional
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from typing import Optional, TYPE_CHECKING
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from telegram.error import BadRequest, RetryAfter
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -17,21 +18,63 @@ from telegram.ext import (
     ContextTypes,
     filters
 )
-from instagram_follower_bot import FollowerBot
 import threading
 import time
+from health_server import HealthServer
+from follower_history import FollowerTimeSeries
+from follow_analytics import load_columns_from_file, follow_back_report, totals_by_source
+from bot_logging import get_logger, setup_logging, recent_events, log_position
+
+
+logger = get_logger('telegram')
+
+# instagrapi (и его pydantic-модели) тяжелый - импортируем только при старте кампании
+if TYPE_CHECKING:
+    from instagram_follower_bot import FollowerBot
 
 
 class TelegramController:
     """Telegram бот для управления Instagram ботом"""
     
-    def __init__(self, telegram_token: str):
+    # Минимальный интервал между правками живого статуса (сек) - лимиты Telegram на edit
+    LIVE_EDIT_INTERVAL = 15
+    
+    # Событий лога на одной странице /logs
+    LOGS_PAGE_SIZE = 15
+    
+    def __init__(self, telegram_token: str, operator_chat_id: Optional[int] = None):
+        """
+        Args:
+            telegram_token: Токен бота от @BotFather
+            operator_chat_id: Чат оператора - только ему доступен /logs (None - /logs выключен)
+        """
         self.telegram_token = telegram_token
-        self.instagram_bot: Optional[FollowerBot] = None
+        self.operator_chat_id = operator_chat_id
+        self.instagram_bot: Optional['FollowerBot'] = None
         self.bot_running = False
         self.bot_thread = None
+        self.last_error = None
         self.config = self._load_config()
         
+        # Последний снимок статистики из потока событий BotStats
+        self.stats_snapshot: Optional[dict] = None
+        
+        # История подписчиков (общая с воркером, см. FollowerBot.history)
+        self.history = FollowerTimeSeries()
+        
+        # Отчет по источникам: грузится с диска при старте, заменяется в конце кампании.
+        # Один и тот же для Telegram, /metrics и /analytics
+        self.source_report: Optional[list] = None
+        self._report_load: Optional[asyncio.Future] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Живой статус (opt-in): одно сообщение, которое редактируется по событиям
+        self.live_message: Optional[Message] = None
+        self._live_dirty = False
+        self._live_task: Optional[asyncio.Task] = None
+        self._live_last_edit = 0.0
+        self._live_last_text = ''
+        
     def _load_config(self) -> dict:
         """Загрузить конфигурацию"""
         try:
@@ -48,6 +91,7 @@ class TelegramController:
                 'targets': [],
                 'mode': 'moderate',
                 'auto_mode': False,
+                'snapshot_interval_hours': 24,  # Как часто выкачивать полный список подписчиков
                 'schedule': {
                     'sessions_per_day': 3,
                     'times': ['09:00', '14:00', '19:00']
@@ -67,6 +111,7 @@ class TelegramController:
              InlineKeyboardButton("⏸️ Остановить", callback_data='stop_bot')],
             [InlineKeyboardButton("⚙️ Настройки", callback_data='settings')],
             [InlineKeyboardButton("📈 Статистика", callback_data='stats')],
+            [InlineKeyboardButton("📡 Живой статус", callback_data='live')],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -95,6 +140,15 @@ class TelegramController:
             await self.show_settings(query)
         elif query.data == 'stats':
             await self.show_stats(query)
+        elif query.data.startswith('history_'):
+            await self.show_history(query, int(query.data.replace('history_', '')))
+        elif query.data.startswith('logs_'):
+            anchor, page = query.data.replace('logs_', '').split('_')
+            await self.show_logs(update, query, int(page), int(anchor))
+        elif query.data == 'sources':
+            await self.show_sources(query)
+        elif query.data == 'live':
+            await self.toggle_live_status(query.message)
         elif query.data == 'back_main':
             await self.show_main_menu(query)
             
@@ -121,12 +175,12 @@ class TelegramController:
             )
 
         elif query.data == 'set_targets':
-            current_targets = ", ".join(self.config.get('targets', [])) or "Нет"
+            current_targets = ", ".join(map(self._format_target, self.config.get('targets', []))) or "Нет"
             context.user_data['state'] = 'WAITING_TARGETS'
             await query.edit_message_text(
                 f"🎯 Целевая аудитория\n\n"
                 f"Текущие цели: {current_targets}\n\n"
-                "Отправьте Username конкурента (без @) или Хештег (без #):\n"
+                "Отправьте Username конкурента (name или @name) или Хештег с # (#tag):\n"
                 "(Можно несколько через запятую)",
                 reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("◀️ Отмена", callback_data='settings')]])
             )
@@ -150,6 +204,13 @@ class TelegramController:
         elif query.data == 'toggle_auto':
             await self.toggle_auto_mode(query)
 
+    @staticmethod
+    def _format_target(target) -> str:
+        """Цель для показа: '#tag' для хештега, 'name' для пользователя"""
+        if isinstance(target, dict):
+            return f"#{target['value']}" if target['type'] == 'hashtag' else target['value']
+        return str(target)
+    
     async def show_status(self, query):
         """Показать статус бота"""
         status_emoji = "🟢" if self.bot_running else "🔴"
@@ -212,13 +273,14 @@ class TelegramController:
     
     async def show_stats(self, query):
         """Показать статистику"""
-        if self.instagram_bot:
-            stats = self.instagram_bot.stats
+        if self.stats_snapshot:
+            stats = self.stats_snapshot
             
             text = (
                 f"📈 Статистика сегодня\n\n"
                 f"➕ Подписались: {stats['followed_today']}\n"
                 f"➖ Отписались: {stats['unfollowed_today']}\n"
+                f"🔁 Подписались в ответ: {stats['followed_back_today']}\n"
                 f"👥 Начало: {stats['start_followers']}\n"
                 f"👥 Сейчас: {stats['current_followers']}\n"
                 f"📊 Прирост: +{stats['followers_gained']}\n"
@@ -226,11 +288,216 @@ class TelegramController:
         else:
             text = "❌ Бот еще не запускался. Статистика недоступна."
         
-        keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='back_main')]]
+        keyboard = [
+            [InlineKeyboardButton("📅 7 дней", callback_data='history_7'),
+             InlineKeyboardButton("📅 30 дней", callback_data='history_30')],
+            [InlineKeyboardButton("🎯 Источники", callback_data='sources')],
+            [InlineKeyboardButton("◀️ Назад", callback_data='back_main')]
+        ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
         await query.edit_message_text(text, reply_markup=reply_markup)
     
+    async def show_history(self, query, days: int):
+        """Показать сводку из истории подписчиков за N дней"""
+        try:
+            summary = self.history.summary(days)
+        except Exception as e:
+            summary = None
+            text = f"❌ Ошибка чтения истории: {e}"
+        
+        if summary and summary['points']:
+            start = summary['start_followers']
+            end = summary['end_followers']
+            text = (
+                f"📅 История за {days} дней\n\n"
+                f"👥 Было: {start if start is not None else '—'}\n"
+                f"👥 Стало: {end if end is not None else '—'}\n"
+                f"📊 Изменение: {summary['change']:+d}\n"
+                f"➕ Подписок: {summary['follows']}\n"
+                f"➖ Отписок: {summary['unfollows']}\n"
+            )
+        elif summary:
+            text = f"📅 За {days} дней данных пока нет."
+        
+        keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='stats')]]
+        await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
+    
+    async def _source_report(self) -> list:
+        """Недельный отчет по источникам (при первом обращении - из файлов, не блокируя loop)"""
+        if self.source_report is None:
+            # Одна загрузка на всех ожидающих; после ошибки следующий вызов пробует снова
+            if self._report_load is None or self._report_load.done():
+                self._report_load = asyncio.ensure_future(asyncio.to_thread(
+                    lambda: follow_back_report(load_columns_from_file())
+                ))
+            report = await asyncio.shield(self._report_load)
+            # Кампания могла успеть положить более свежий отчет
+            if self.source_report is None:
+                self.source_report = report
+        return self.source_report
+    
+    async def _preload_source_report(self):
+        """Фоновая загрузка отчета при старте (порт к этому моменту уже открыт)"""
+        try:
+            await self._source_report()
+        except Exception as e:
+            logger.warning(f"⚠️ Error loading source analytics: {e}")
+    
+    async def show_sources(self, query):
+        """Показать процент взаимных подписок по источникам"""
+        try:
+            totals = totals_by_source(await self._source_report())
+        except Exception as e:
+            totals = None
+            text = f"❌ Ошибка аналитики: {e}"
+        
+        if totals:
+            text = "🎯 Взаимные подписки по источникам\n\n"
+            for row in totals[:15]:
+                hours = f", ~{row['avg_hours']:.0f} ч" if row['avg_hours'] is not None else ""
+                text += (
+                    f"{row['source']}: {row['followed_back']}/{row['follows']} "
+                    f"({row['rate'] * 100:.1f}%{hours})\n"
+                )
+        elif totals is not None:
+            text = "🎯 Данных по источникам пока нет."
+        
+        keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='stats')]]
+        await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
+    
+    def _is_operator(self, update: Update) -> bool:
+        """Пришел ли апдейт из чата оператора (в логах бывают данные аккаунта)"""
+        chat = update.effective_chat
+        return self.operator_chat_id is not None and chat is not None and chat.id == self.operator_chat_id
+    
+    def _format_logs_page(self, page: int, anchor: int):
+        """
+        Текст и кнопки страницы лога из кольцевого буфера
+        
+        Args:
+            page: Номер страницы от якоря (0 - самые свежие)
+            anchor: Позиция в логе на момент открытия первой страницы -
+                новые события не сдвигают уже открытые страницы
+        """
+        events = recent_events(page, self.LOGS_PAGE_SIZE, anchor)
+        
+        if events:
+            lines = []
+            for event in events:
+                msg = event['msg'] if len(event['msg']) <= 200 else event['msg'][:200] + '…'
+                lines.append(f"{event['ts'][11:19]} {event['level'][0]} {msg}")
+            text = f"📜 Лог (стр. {page + 1}, новые сверху)\n\n" + "\n".join(lines)
+        else:
+            text = "📜 Лог пуст." if page == 0 else "📜 Больше событий нет."
+        
+        nav = []
+        if len(events) == self.LOGS_PAGE_SIZE:
+            nav.append(InlineKeyboardButton("⬅️ Старее", callback_data=f'logs_{anchor}_{page + 1}'))
+        if page > 0:
+            nav.append(InlineKeyboardButton("Новее ➡️", callback_data=f'logs_{anchor}_{page - 1}'))
+        
+        keyboard = [nav] if nav else []
+        keyboard.append([InlineKeyboardButton("◀️ Назад", callback_data='back_main')])
+        return text, InlineKeyboardMarkup(keyboard)
+    
+    async def logs_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обработчик команды /logs [страница]"""
+        if not self._is_operator(update):
+            await update.message.reply_text("⛔ Лог доступен только оператору (TELEGRAM_OPERATOR_CHAT_ID).")
+            return
+        
+        page = int(context.args[0]) - 1 if context.args and context.args[0].isdigit() else 0
+        text, reply_markup = self._format_logs_page(max(0, page), log_position())
+        await update.message.reply_text(text, reply_markup=reply_markup)
+    
+    async def show_logs(self, update: Update, query, page: int, anchor: int):
+        """Показать страницу лога"""
+        if not self._is_operator(update):
+            await query.edit_message_text("⛔ Лог доступен только оператору.")
+            return
+        
+        text, reply_markup = self._format_logs_page(page, anchor)
+        await query.edit_message_text(text, reply_markup=reply_markup)
+    
+    async def live_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обработчик команды /live"""
+        await self.toggle_live_status(update.message)
+    
+    async def toggle_live_status(self, message: Message):
+        """Включить/выключить живой статус (сообщение обновляется само)"""
+        if self.live_message:
+            self.live_message = None
+            await message.reply_text("⏹️ Живой статус выключен")
+            return
+        
+        self._live_last_text = self._format_live_status()
+        self.live_message = await message.reply_text(self._live_last_text)
+        self._live_last_edit = time.monotonic()
+    
+    def _format_live_status(self) -> str:
+        """Текст живого статуса из последнего снимка статистики"""
+        state_names = {
+            'running': '🟢 Работает',
+            'stopped': '🔴 Остановлен',
+            'error': '❌ Ошибка'
+        }
+        state = self._worker_state()
+        text = f"📡 Живой статус\n\n🤖 Бот: {state_names[state['state']]}\n"
+        
+        if state['last_error']:
+            text += f"⚠️ {state['last_error']}\n"
+        
+        stats = self.stats_snapshot
+        if stats:
+            text += (
+                f"➕ Подписались: {stats['followed_today']}\n"
+                f"➖ Отписались: {stats['unfollowed_today']}\n"
+                f"👥 Сейчас: {stats['current_followers']}\n"
+                f"📊 Прирост: +{stats['followers_gained']}\n"
+            )
+        
+        return text + f"\n🕒 {datetime.now().strftime('%H:%M:%S')}\n/live - выключить"
+    
+    def _mark_live_dirty(self):
+        """Отметить, что живой статус устарел (в event loop); правки склеиваются"""
+        if not self.live_message:
+            return
+        self._live_dirty = True
+        if self._live_task is None or self._live_task.done():
+            self._live_task = asyncio.get_running_loop().create_task(self._live_edit_loop())
+    
+    async def _live_edit_loop(self):
+        """Править живой статус не чаще LIVE_EDIT_INTERVAL, всегда с последним снимком"""
+        while self.live_message and self._live_dirty:
+            wait = self.LIVE_EDIT_INTERVAL - (time.monotonic() - self._live_last_edit)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            # Все события, пришедшие за время ожидания, попадут в одну правку
+            self._live_dirty = False
+            message = self.live_message
+            if not message:
+                return
+            
+            text = self._format_live_status()
+            try:
+                await message.edit_text(text)
+                self._live_last_text = text
+            except RetryAfter as e:
+                # Telegram просит подождать - повторим позже
+                self._live_dirty = True
+                self._live_last_edit = time.monotonic() + e.retry_after
+                continue
+            except BadRequest as e:
+                if 'not modified' not in str(e).lower():
+                    # Сообщение удалено или недоступно - выключаем живой статус
+                    logger.warning(f"⚠️ Live status disabled: {e}")
+                    self.live_message = None
+                    return
+            
+            self._live_last_edit = time.monotonic()
+    
     async def change_mode(self, query, mode: str):
         """Изменить режим работы"""
         self.config['mode'] = mode
@@ -270,6 +537,9 @@ class TelegramController:
         
         await query.answer("▶️ Запускаю бота...")
         
+        # Event loop нужен воркеру, чтобы передавать события статистики
+        self.loop = asyncio.get_running_loop()
+        
         # Запуск в отдельном потоке
         self.bot_thread = threading.Thread(target=self._run_instagram_bot)
         self.bot_thread.daemon = True
@@ -304,6 +574,7 @@ class TelegramController:
              InlineKeyboardButton("⏸️ Остановить", callback_data='stop_bot')],
             [InlineKeyboardButton("⚙️ Настройки", callback_data='settings')],
             [InlineKeyboardButton("📈 Статистика", callback_data='stats')],
+            [InlineKeyboardButton("📡 Живой статус", callback_data='live')],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
@@ -316,12 +587,19 @@ class TelegramController:
     def _run_instagram_bot(self):
         """Запустить Instagram бота (в отдельном потоке)"""
         try:
+            # Ленивый импорт: instagrapi грузится только когда кампания реально стартует
+            from instagram_follower_bot import FollowerBot
+            
             # Инициализация
             self.instagram_bot = FollowerBot(
                 username=self.config['instagram']['username'],
                 password=self.config['instagram']['password'],
-                proxy=self.config['instagram'].get('proxy') # Передаем прокси
+                proxy=self.config['instagram'].get('proxy'), # Передаем прокси
+                history=self.history,
+                snapshot_interval_hours=self.config.get('snapshot_interval_hours', 24)
             )
+            self.stats_snapshot = self.instagram_bot.stats.snapshot()
+            self.instagram_bot.stats.subscribe(self._on_stats_event)
             
             
             # Сбрасываем ошибку перед запуском
@@ -352,6 +630,10 @@ class TelegramController:
                     delay_range=mode_config['delay']
                 )
                 
+                # Свежий отчет по источникам (замена ссылки атомарна)
+                if self.instagram_bot.source_report is not None:
+                    self.source_report = self.instagram_bot.source_report
+                
                 # Если не авто-режим - останавливаемся после одной сессии
                 if not self.config.get('auto_mode'):
                     break
@@ -362,9 +644,28 @@ class TelegramController:
             
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ Error in Instagram bot: {error_msg}")
+            logger.error(f"❌ Error in Instagram bot: {error_msg}")
             self.last_error = error_msg # Сохраняем ошибку для вывода в TG
             self.bot_running = False
+        finally:
+            self.bot_running = False
+            
+            # Финальное обновление живого статуса (остановка/ошибка)
+            if self.loop and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._mark_live_dirty)
+    
+    def _on_stats_event(self, event: dict):
+        """Событие BotStats (вызывается в потоке воркера) - передаем в event loop"""
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._apply_stats_event, event)
+    
+    def _apply_stats_event(self, event: dict):
+        """Применить событие статистики (в event loop)"""
+        # События могут прийти не по порядку - берем только более свежие
+        if self.stats_snapshot and event['seq'] <= self.stats_snapshot.get('seq', 0):
+            return
+        self.stats_snapshot = dict(event['snapshot'], seq=event['seq'])
+        self._mark_live_dirty()
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обработчик текстовых сообщений"""
@@ -413,7 +714,9 @@ class TelegramController:
              await update.message.reply_text("Вернуться в меню:", reply_markup=InlineKeyboardMarkup(keyboard))
 
         elif state == 'WAITING_TARGETS':
-            new_targets = [t.strip() for t in text.split(',')]
+            # Формат как у FollowerBot._normalize_source: '#tag' - хештег, иначе username
+            new_targets = [t.strip().lstrip('@') for t in text.split(',')]
+            new_targets = [t for t in new_targets if t.strip('#')]
             
             # Добавляем, а не заменяем (или можно заменить)
             current = self.config.get('targets', [])
@@ -433,23 +736,116 @@ class TelegramController:
             keyboard = [[InlineKeyboardButton("🔙 В настройки", callback_data='settings')]]
             await update.message.reply_text("Вернуться в меню:", reply_markup=InlineKeyboardMarkup(keyboard))
     
-    def run(self):
-        """Запустить Telegram бота"""
-        app = Application.builder().token(self.telegram_token).build()
+    def _worker_state(self) -> dict:
+        """Реальное состояние Instagram воркера (для /health и /status)"""
+        thread_alive = bool(self.bot_thread and self.bot_thread.is_alive())
+        
+        if self.last_error:
+            state = 'error'
+        elif self.bot_running and thread_alive:
+            state = 'running'
+        else:
+            state = 'stopped'
+        
+        return {
+            'state': state,
+            'running': self.bot_running,
+            'thread_alive': thread_alive,
+            'logged_in': self.config['instagram'].get('logged_in', False),
+            'last_error': self.last_error,
+        }
+    
+    def _health_endpoint(self) -> dict:
+        """GET /health"""
+        return {'status': 'ok', 'bot': self._worker_state()['state']}
+    
+    def _status_endpoint(self) -> dict:
+        """GET /status"""
+        status = self._worker_state()
+        status.update({
+            'mode': self.config.get('mode'),
+            'auto_mode': self.config.get('auto_mode', False),
+            'targets': len(self.config.get('targets', [])),
+            'proxy': bool(self.config['instagram'].get('proxy')),
+        })
+        return status
+    
+    def _metrics_endpoint(self) -> str:
+        """GET /metrics (формат Prometheus)"""
+        state = self._worker_state()
+        lines = [
+            f"instagram_bot_running {int(state['running'])}",
+            f"instagram_bot_thread_alive {int(state['thread_alive'])}",
+            f"instagram_bot_error {int(bool(state['last_error']))}",
+        ]
+        if self.stats_snapshot:
+            for key, value in self.stats_snapshot.items():
+                if key != 'seq':
+                    lines.append(f"instagram_bot_{key} {value}")
+        for row in totals_by_source(self.source_report or []):
+            source = row['source'].replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'instagram_bot_follow_back_rate{{source="{source}"}} {row["rate"]:.4f}')
+        return "\n".join(lines) + "\n"
+    
+    def _analytics_endpoint(self) -> dict:
+        """GET /analytics (отчет по источникам и неделям)"""
+        report = self.source_report or []
+        return {
+            'weeks': report,
+            'sources': totals_by_source(report),
+        }
+    
+    def run(self, http_port: Optional[int] = None):
+        """
+        Запустить Telegram бота
+        
+        Args:
+            http_port: Порт для health/status/metrics (None - без HTTP сервера)
+        """
+        builder = Application.builder().token(self.telegram_token)
+        server = None
+        
+        if http_port is not None:
+            # HTTP сервер живет в том же event loop, что и polling
+            server = HealthServer(port=http_port)
+            server.route('/', lambda: "✅ Instagram Bot is running!")
+            server.route('/health', self._health_endpoint)
+            server.route('/status', self._status_endpoint)
+            server.route('/metrics', self._metrics_endpoint)
+            server.route('/analytics', self._analytics_endpoint)
+        
+        async def on_startup(application: Application):
+            # Сначала открываем порт (проверка хостинга), историю грузим в фоне:
+            # полный проход по архиву может занять секунды
+            if server:
+                await server.start()
+            asyncio.create_task(self._preload_source_report())
+        
+        async def on_shutdown(application: Application):
+            if server:
+                await server.stop()
+        
+        builder = builder.post_init(on_startup).post_shutdown(on_shutdown)
+        
+        app = builder.build()
         
         # Handlers
         app.add_handler(CommandHandler("start", self.start))
         app.add_handler(CommandHandler("status", self.status_command))  # Добавили обработчик команды /status
+        app.add_handler(CommandHandler("live", self.live_command))
+        app.add_handler(CommandHandler("logs", self.logs_command))
         app.add_handler(CallbackQueryHandler(self.button_handler))
         app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
-        print("🤖 Telegram bot started!")
+        logger.info("🤖 Telegram bot started!")
         app.run_polling()
 
 
 def main():
     """Запуск Telegram контроллера"""
     
+    setup_logging()
+    
     # Получаем токен из переменной окружения (для Render.com)
     TELEGRAM_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_TELEGRAM_BOT_TOKEN')
     
@@ -461,37 +857,23 @@ def main():
         print("4. Скопируйте токен и установите переменную окружения TELEGRAM_BOT_TOKEN")
         return
     
-    print(f"✅ Token loaded: {TELEGRAM_TOKEN[:10]}...")
-    
-    # Для Render.com: запускаем фейковый веб-сервер в отдельном потоке
-    # чтобы Render видел что порт открыт
-    import threading
-    from flask import Flask
-    
-    app = Flask(__name__)
-    
-    @app.route('/')
-    def home():
-        return "✅ Instagram Bot is running!"
-    
-    @app.route('/health')
-    def health():
-        return {"status": "ok", "bot": "running"}
-    
-    # Запускаем Flask в отдельном потоке
-    def run_flask():
-        port = int(os.getenv('PORT', 10000))
-        app.run(host='0.0.0.0', port=port)
+    logger.info("✅ Token loaded")
     
-    flask_thread = threading.Thread(target=run_flask)
-    flask_thread.daemon = True
-    flask_thread.start()
+    # Чат оператора для /logs (id можно узнать у @userinfobot)
+    operator_chat_id = os.getenv('TELEGRAM_OPERATOR_CHAT_ID', '').strip()
+    if operator_chat_id.lstrip('-').isdigit():
+        operator_chat_id = int(operator_chat_id)
+    else:
+        operator_chat_id = None
+        logger.warning("⚠️ TELEGRAM_OPERATOR_CHAT_ID not set - /logs is disabled")
     
-    print(f"✅ Web server started on port {os.getenv('PORT', 10000)}")
+    # Для Render.com: порт должен быть открыт, поэтому поднимаем
+    # health/status/metrics прямо в event loop Telegram бота
+    port = int(os.getenv('PORT', 10000))
     
     # Запускаем Telegram бота
-    controller = TelegramController(TELEGRAM_TOKEN)
-    controller.run()
+    controller = TelegramController(TELEGRAM_TOKEN, operator_chat_id=operator_chat_id)
+    controller.run(http_port=port)
 
 
 if __name__ == "__main__":
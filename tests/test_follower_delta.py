@@ -0,0 +1,20 @@
+"""
+FollowerDeltaEngine: время последнего снимка без чтения самого снимка
+"""
+
+import time
+
+from follower_delta import FollowerDeltaEngine
+
+
+def test_latest_time(tmp_path):
+    engine = FollowerDeltaEngine(str(tmp_path / 'snapshots'))
+    assert engine.latest_time() is None
+
+    before = time.time()
+    assert engine.update([3, 1, 2]) is None
+    taken_at = engine.latest_time()
+
+    assert before - 1 <= taken_at <= time.time()
+    assert engine.latest_with_time()[0] == taken_at
+    assert list(engine.latest()) == [1, 2, 3]
@@ -0,0 +1,41 @@
+"""
+HealthServer: ответы на корректные и мусорные запросы
+"""
+
+import asyncio
+
+from health_server import HealthServer
+
+
+async def _request(raw: bytes) -> bytes:
+    """Поднять сервер на свободном порту, отправить raw и прочитать ответ"""
+    server = HealthServer('127.0.0.1', 0)
+    server.route('/health', lambda: {'status': 'ok'})
+    await server.start()
+    port = server._server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 2)
+        writer.close()
+        return response
+    finally:
+        await server.stop()
+
+
+def test_health_ok():
+    response = asyncio.run(_request(b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert response.endswith(b'{"status": "ok"}')
+
+
+def test_garbage_request_line_gets_immediate_400():
+    for raw in (b"\r\n", b"garbage\r\n"):
+        response = asyncio.run(_request(raw))
+        assert response.startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_unknown_path_and_method():
+    assert asyncio.run(_request(b"GET /nope HTTP/1.1\r\n\r\n")).startswith(b"HTTP/1.1 404")
+    assert asyncio.run(_request(b"POST /health HTTP/1.1\r\n\r\n")).startswith(b"HTTP/1.1 405")
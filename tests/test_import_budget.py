@@ -0,0 +1,56 @@
+"""
+Бюджет импорта Telegram контроллера: тяжелые зависимости грузятся лениво
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Лимиты для процесса контроллера (free-tier dyno)
+IMPORT_TIME_BUDGET = 2.0   # секунд на import telegram_control_bot
+RSS_BUDGET_MB = 80         # пиковый RSS процесса после импорта
+
+# Не должны импортироваться до старта кампании
+LAZY_MODULES = ('instagram_follower_bot', 'instagrapi', 'flask')
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import telegram_control_bot
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'elapsed': elapsed,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+@pytest.fixture(scope='module')
+def probe():
+    """Импортировать контроллер в чистом процессе и снять замеры"""
+    pytest.importorskip('telegram')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_not_imported(probe):
+    assert probe['loaded'] == []
+
+
+def test_import_time_budget(probe):
+    assert probe['elapsed'] < IMPORT_TIME_BUDGET
+
+
+def test_rss_budget(probe):
+    assert probe['rss_mb'] < RSS_BUDGET_MB
@@ -0,0 +1,63 @@
+"""
+RelationshipArchive: повторный перенос после сбоя не дублирует записи
+"""
+
+import gzip
+import json
+import os
+from array import array
+
+from relationship_archive import RelationshipArchive
+
+
+def _archive(tmp_path) -> RelationshipArchive:
+    return RelationshipArchive(str(tmp_path / 'a.jsonl.gz'), str(tmp_path / 'a.ids'))
+
+
+def test_append_skips_archived_ids(tmp_path):
+    archive = _archive(tmp_path)
+    archive.append({'1': {'source': 'x'}, '2': {'source': 'y'}})
+    archive.append({'2': {'source': 'y'}, '3': {'source': 'z'}})
+
+    assert [uid for uid, _ in archive.scan()] == ['1', '2', '3']
+    assert list(_archive(tmp_path).ids) == [1, 2, 3]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    archive = _archive(tmp_path)
+    archive.append({'1': {}})
+
+    # Сбой после записи пачки, но до обновления индекса
+    with gzip.open(archive.path, 'at', encoding='utf-8') as f:
+        f.write(json.dumps({'id': '2'}) + '\n')
+    stat = os.stat(archive.ids_path)
+    os.utime(archive.ids_path, ns=(stat.st_atime_ns, os.stat(archive.path).st_mtime_ns - 1))
+
+    reopened = _archive(tmp_path)
+    assert reopened.contains('2')
+    reopened.append({'2': {}})
+    assert [uid for uid, _ in reopened.scan()] == ['1', '2']
+
+
+def test_torn_member_is_dropped(tmp_path):
+    archive = _archive(tmp_path)
+    archive.append({'1': {}, '2': {}})
+    size = os.path.getsize(archive.path)
+    archive.append({str(uid): {'source': 'x' * 50} for uid in range(3, 200)})
+
+    # Сбой посреди записи второй пачки (индекс остался от первой)
+    with open(archive.path, 'r+b') as f:
+        f.truncate(size + (os.path.getsize(archive.path) - size) // 2)
+    with open(archive.ids_path, 'wb') as f:
+        array('q', [1, 2]).tofile(f)
+    stat = os.stat(archive.ids_path)
+    os.utime(archive.ids_path, ns=(stat.st_atime_ns, os.stat(archive.path).st_mtime_ns - 1))
+
+    assert [uid for uid, _ in _archive(tmp_path).scan()] == ['1', '2']
+
+    reopened = _archive(tmp_path)
+    reopened.append({'3': {}})
+    assert os.path.getsize(archive.path) > size
+    assert [uid for uid, _ in reopened.scan()] == ['1', '2', '3']
+    with gzip.open(archive.path, 'rt') as f:
+        assert len(f.readlines()) == 3
@@ -0,0 +1,130 @@
+"""
+state_transfer: перезапись без остатков, возобновление переноса и экспорта
+"""
+
+import json
+import os
+
+import pytest
+
+import state_transfer
+from relationship_archive import RelationshipArchive
+from state_transfer import (
+    ARCHIVE, ARCHIVE_IDS, CONFIG, FOLLOWED_USERS, STAGING, WHITELIST,
+    export_state, import_state,
+)
+
+
+def _write_state(base, users, archived=None, config=None):
+    os.makedirs(base, exist_ok=True)
+    with open(os.path.join(base, FOLLOWED_USERS), 'w') as f:
+        json.dump(users, f)
+    if archived:
+        RelationshipArchive(os.path.join(base, ARCHIVE), os.path.join(base, ARCHIVE_IDS)).append(archived)
+    if config is not None:
+        with open(os.path.join(base, CONFIG), 'w') as f:
+            json.dump(config, f)
+
+
+def _archived_ids(base):
+    archive = RelationshipArchive(os.path.join(base, ARCHIVE), os.path.join(base, ARCHIVE_IDS))
+    return [uid for uid, _ in archive.scan()], list(archive.ids)
+
+
+def test_overwrite_removes_files_missing_from_backup(tmp_path):
+    src, dst = str(tmp_path / 'src'), str(tmp_path / 'dst')
+    _write_state(src, {'1': {'source': 'a'}})
+    _write_state(dst, {'9': {}}, archived={'8': {}}, config={'mode': 'safe'})
+
+    backup = str(tmp_path / 'b.igst')
+    export_state(backup, base_dir=src)
+    with pytest.raises(FileExistsError):
+        import_state(backup, base_dir=dst)
+    import_state(backup, base_dir=dst, overwrite=True)
+
+    for name in (ARCHIVE, ARCHIVE_IDS, CONFIG):
+        assert not os.path.exists(os.path.join(dst, name))
+    with open(os.path.join(dst, FOLLOWED_USERS)) as f:
+        assert json.load(f) == {'1': {'source': 'a'}}
+    assert os.path.exists(os.path.join(dst, WHITELIST))
+
+
+def test_import_resumes_after_crash_in_finalize(tmp_path, monkeypatch):
+    src, dst = str(tmp_path / 'src'), str(tmp_path / 'dst')
+    _write_state(src, {'1': {}}, archived={'3': {}, '2': {}}, config={'mode': 'safe'})
+    backup = str(tmp_path / 'b.igst')
+    export_state(backup, base_dir=src)
+
+    # Падаем сразу после переноса архива, до переноса индекса
+    real_replace = os.replace
+
+    def crashing_replace(source, target):
+        if target.endswith(ARCHIVE_IDS):
+            raise OSError('crash')
+        real_replace(source, target)
+
+    monkeypatch.setattr(state_transfer.os, 'replace', crashing_replace)
+    with pytest.raises(OSError):
+        import_state(backup, base_dir=dst)
+    monkeypatch.setattr(state_transfer.os, 'replace', real_replace)
+
+    assert import_state(backup, base_dir=dst) == 5
+    assert not os.path.exists(os.path.join(dst, STAGING))
+    assert _archived_ids(dst) == (['3', '2'], [2, 3])
+    with open(os.path.join(dst, CONFIG)) as f:
+        assert json.load(f) == {'mode': 'safe'}
+
+
+def test_export_restarts_when_source_changed(tmp_path, monkeypatch):
+    src = str(tmp_path / 'src')
+    _write_state(src, {str(i): {} for i in range(1, 6)})
+    backup = str(tmp_path / 'b.igst')
+
+    # Прерываем экспорт после первого кадра
+    monkeypatch.setattr(state_transfer, 'CHUNK_RECORDS', 2)
+    real_save = state_transfer._save_progress
+
+    def crashing_save(path, progress):
+        real_save(path, progress)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(state_transfer, '_save_progress', crashing_save)
+    with pytest.raises(KeyboardInterrupt):
+        export_state(backup, base_dir=src)
+    monkeypatch.setattr(state_transfer, '_save_progress', real_save)
+
+    # Бот успел сохранить состояние: одна запись ушла, одна добавилась
+    _write_state(src, {str(i): {} for i in range(2, 8)})
+    assert export_state(backup, base_dir=src) == 7
+
+    dst = str(tmp_path / 'dst')
+    import_state(backup, base_dir=dst)
+    with open(os.path.join(dst, FOLLOWED_USERS)) as f:
+        assert sorted(json.load(f), key=int) == [str(i) for i in range(2, 8)]
+
+
+def test_import_restarts_for_a_different_backup(tmp_path, monkeypatch):
+    # Мелкие кадры, чтобы импорт a можно было прервать после первого
+    monkeypatch.setattr(state_transfer, 'CHUNK_RECORDS', 2)
+    backups = []
+    for name, users in (('a', range(1, 6)), ('b', range(10, 13))):
+        src = str(tmp_path / name)
+        _write_state(src, {str(i): {} for i in users})
+        backups.append(str(tmp_path / f'{name}.igst'))
+        export_state(backups[-1], base_dir=src)
+
+    real_save = state_transfer._save_progress
+
+    def crashing_save(path, progress):
+        real_save(path, progress)
+        raise KeyboardInterrupt
+
+    dst = str(tmp_path / 'dst')
+    monkeypatch.setattr(state_transfer, '_save_progress', crashing_save)
+    with pytest.raises(KeyboardInterrupt):
+        import_state(backups[0], base_dir=dst)
+    monkeypatch.setattr(state_transfer, '_save_progress', real_save)
+
+    assert import_state(backups[1], base_dir=dst) == 4
+    with open(os.path.join(dst, FOLLOWED_USERS)) as f:
+        assert sorted(json.load(f)) == ['10', '11', '12']